@@ -13,12 +13,25 @@ blf_scan.py  –  list frame type + attribute names for every object in a BLF.
 
 * Streams the file – only the current object is in memory.
 * Works with either the 'vblf' or the 'python-can' backend.
+* --columnar decodes CAN / CAN FD frames natively into NumPy chunks
+  (see iter_blf_batches) – memory is bounded by the chunk size.
 """
 
 import argparse
 import importlib
+import json
+import os
+import re
+import struct
 import sys
-from typing import Iterable, List
+import zlib
+from array import array
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
 
 
 def iter_blf(path: str):
@@ -47,6 +60,751 @@ def iter_blf(path: str):
         sys.exit("❌  Neither 'vblf' nor 'python-can' is installed.")
 
 
+# ---------------------------------------------------------------------------
+# Native columnar decoding (no backend needed)
+# ---------------------------------------------------------------------------
+
+BLF_FILE_SIGNATURE = b"LOGG"
+BLF_OBJ_SIGNATURE = b"LOBJ"
+
+# signature, header size, header version, object size, object type
+OBJ_HEADER_BASE = struct.Struct("<4sHHLL")
+# flags, client index, object version, timestamp
+OBJ_HEADER_V1 = struct.Struct("<LHHQ")
+# flags, timestamp status, reserved, object version, timestamp, original timestamp
+OBJ_HEADER_V2 = struct.Struct("<LBBHQQ")
+# compression method, uncompressed size
+LOG_CONTAINER_HEADER = struct.Struct("<H6xL4x")
+FILE_HEADER_START = struct.Struct("<4sL")           # signature, header size
+
+CAN_MESSAGE_STRUCT = struct.Struct("<HBBL8s")        # channel, flags, dlc, id, data
+CAN_FD_MESSAGE_STRUCT = struct.Struct("<HBBLLBBB5x64s")  # … frame length, bit count, FD flags, valid bytes, data
+# channel, dlc, valid bytes, tx count, id, frame length, flags, btr arb, btr data,
+# brs offset, crc offset, bit count, direction, ext data offset, crc – data follows
+CAN_FD_MESSAGE_64_STRUCT = struct.Struct("<BBBBLLLLLLLHBBL")
+
+CAN_MESSAGE = 1
+LOG_CONTAINER = 10
+CAN_MESSAGE2 = 86
+CAN_FD_MESSAGE = 100
+CAN_FD_MESSAGE_64 = 101
+
+NO_COMPRESSION = 0
+ZLIB_DEFLATE = 2
+TIME_TEN_MICS = 1                  # object flag: timestamp in 10 µs units (else ns)
+CAN_MSG_EXT = 0x80000000           # extended-ID bit inside the BLF arbitration id
+
+# frame flags in the columnar output
+FRAME_EXTENDED = 0x01
+FRAME_REMOTE = 0x02
+FRAME_FD = 0x04
+FRAME_BRS = 0x08
+FRAME_ESI = 0x10
+FRAME_TX = 0x20
+
+MAX_PAYLOAD = 64
+DEFAULT_CHUNK_FRAMES = 65536
+# CAN_FD_MESSAGE_64 objects are not padded to 4 bytes by their size field, but
+# some writers still pad them (by up to 8 bytes), so the next LOBJ is searched for
+MAX_OBJECT_PADDING = 8
+
+BLF_FRAME_DTYPE = np.dtype([
+    ("timestamp", "<f8"),          # seconds since start of measurement
+    ("channel", "<u2"),            # 1-based as stored in the BLF object (CANoe "CAN 1" = 1)
+    ("arbitration_id", "<u4"),     # without the extended-ID bit, see FRAME_EXTENDED
+    ("dlc", "u1"),
+    ("length", "u1"),              # valid bytes in data
+    ("flags", "<u4"),              # FRAME_* bits
+    ("object_type", "<u2"),
+    ("data", "u1", (MAX_PAYLOAD,)),
+])
+
+
+def read_blf_file_header(f) -> int:
+    """Check the file signature; returns the offset of the first object."""
+    f.seek(0)
+    signature, header_size = FILE_HEADER_START.unpack(f.read(FILE_HEADER_START.size))
+    if signature != BLF_FILE_SIGNATURE:
+        raise ValueError("not a BLF file")
+    return header_size
+
+
+def read_blf_block(f, offset: int):
+    """
+    Payload of the top-level object at `offset` – the decompressed data of a
+    LOG_CONTAINER, any other object as it is – and the offset of the next one.
+    Returns (None, offset) at end of file.
+    """
+    f.seek(offset)
+    base = f.read(OBJ_HEADER_BASE.size)
+    if len(base) < OBJ_HEADER_BASE.size:
+        return None, offset
+    signature, _, _, obj_size, obj_type = OBJ_HEADER_BASE.unpack(base)
+    if signature != BLF_OBJ_SIGNATURE:
+        raise ValueError(f"no BLF object at offset {offset}")
+    body = f.read(obj_size - OBJ_HEADER_BASE.size)
+    next_offset = offset + obj_size + obj_size % 4       # objects are 4-byte aligned
+    if obj_type != LOG_CONTAINER:
+        return base + body, next_offset
+    method, _ = LOG_CONTAINER_HEADER.unpack_from(body)
+    data = body[LOG_CONTAINER_HEADER.size:]
+    if method == ZLIB_DEFLATE:
+        data = zlib.decompress(data)
+    elif method != NO_COMPRESSION:
+        raise ValueError(f"unknown container compression {method} at offset {offset}")
+    return data, next_offset
+
+
+def iter_blf_blocks(f) -> Iterator[tuple]:
+    """Yield (file offset, payload) for every top-level object of an open BLF file."""
+    offset = read_blf_file_header(f)
+    while True:
+        data, next_offset = read_blf_block(f, offset)
+        if data is None:
+            return
+        yield offset, data
+        offset = next_offset
+
+
+def scan_blf_offsets(path: str) -> List[int]:
+    """File offsets of all top-level objects (normally LOG_CONTAINERs), reading only their headers."""
+    offsets = []
+    with open(path, "rb") as f:
+        offset = read_blf_file_header(f)
+        while True:
+            f.seek(offset)
+            base = f.read(OBJ_HEADER_BASE.size)
+            if len(base) < OBJ_HEADER_BASE.size:
+                return offsets
+            signature, _, _, obj_size, _ = OBJ_HEADER_BASE.unpack(base)
+            if signature != BLF_OBJ_SIGNATURE:
+                raise ValueError(f"no BLF object at offset {offset}")
+            offsets.append(offset)
+            offset += obj_size + obj_size % 4
+
+
+def _find_next_object(buf, pos: int):
+    """
+    Offset of the LOBJ at `pos` or within MAX_OBJECT_PADDING bytes after it.
+    Returns `pos` if the padding may run past the end of `buf`, None if there is no LOBJ.
+    """
+    found = buf.find(BLF_OBJ_SIGNATURE, pos, pos + MAX_OBJECT_PADDING + len(BLF_OBJ_SIGNATURE))
+    if found >= 0:
+        return found
+    return pos if pos + MAX_OBJECT_PADDING + len(BLF_OBJ_SIGNATURE) > len(buf) else None
+
+
+def split_blf_objects(buf, max_objects: int = None):
+    """
+    Yield (object type, timestamp in s, buffer, body offset, object offset) for
+    the complete objects at the start of `buf` (at most `max_objects`). Returns
+    the offset where the next object starts – where the carried-over tail starts.
+    """
+    pos, size, count = 0, len(buf), 0
+    while pos + OBJ_HEADER_BASE.size <= size and count != max_objects:
+        signature, header_size, header_version, obj_size, obj_type = OBJ_HEADER_BASE.unpack_from(buf, pos)
+        if signature != BLF_OBJ_SIGNATURE:
+            next_pos = _find_next_object(buf, pos)
+            if next_pos is None:
+                raise ValueError(f"BLF object signature missing inside container data (offset {pos})")
+            if next_pos == pos:
+                break                          # padding continues in the next container
+            pos = next_pos
+            continue
+        if header_size < OBJ_HEADER_BASE.size or obj_size < header_size:
+            # would never advance past this object
+            raise ValueError(f"BLF object at offset {pos} is smaller than its header "
+                             f"(object {obj_size} bytes, header {header_size} bytes)")
+        next_pos = pos + obj_size
+        if obj_type != CAN_FD_MESSAGE_64:      # the only type written without padding
+            next_pos += obj_size % 4
+        if next_pos > size:
+            break
+        if header_version == 1:
+            flags, _, _, timestamp = OBJ_HEADER_V1.unpack_from(buf, pos + OBJ_HEADER_BASE.size)
+        else:
+            flags, _, _, _, timestamp, _ = OBJ_HEADER_V2.unpack_from(buf, pos + OBJ_HEADER_BASE.size)
+        yield obj_type, timestamp * (1e-5 if flags == TIME_TEN_MICS else 1e-9), buf, pos + header_size, pos
+        pos = next_pos
+        count += 1
+    if pos < size and buf[pos:pos + len(BLF_OBJ_SIGNATURE)] != BLF_OBJ_SIGNATURE:
+        pos = _find_next_object(buf, pos) or pos   # step over padding so ranges end where the next object starts
+    return pos
+
+
+def iter_blf_objects(blocks: Iterable[tuple]) -> Iterator[tuple]:
+    """
+    Split container payloads into objects (see split_blf_objects). Objects may
+    span containers, so the incomplete tail of one block is carried into the next.
+    """
+    tail = b""
+    for _, data in blocks:
+        buf = tail + data if tail else data
+        pos = yield from split_blf_objects(buf)
+        tail = buf[pos:]
+
+
+class FrameColumns:
+    """Append-only column buffers for up to `capacity` frames, emitted as one structured array."""
+
+    def __init__(self, capacity: int = DEFAULT_CHUNK_FRAMES):
+        self.capacity = capacity
+        self.clear()
+
+    def clear(self):
+        self.timestamp = array("d")
+        self.channel = array("H")
+        self.arbitration_id = array("L")
+        self.dlc = array("B")
+        self.length = array("B")
+        self.flags = array("L")
+        self.object_type = array("H")
+        self.data = bytearray()
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def append(self, timestamp, channel, arbitration_id, dlc, length, flags, object_type, payload):
+        self.timestamp.append(timestamp)
+        self.channel.append(channel)
+        self.arbitration_id.append(arbitration_id)
+        self.dlc.append(dlc)
+        self.length.append(length)
+        self.flags.append(flags)
+        self.object_type.append(object_type)
+        self.data += payload[:length].ljust(MAX_PAYLOAD, b"\0")
+
+    def to_array(self) -> np.ndarray:
+        out = np.empty(len(self), dtype=BLF_FRAME_DTYPE)
+        for name in ("timestamp", "channel", "arbitration_id", "dlc", "length", "flags", "object_type"):
+            out[name] = getattr(self, name)
+        out["data"] = np.frombuffer(bytes(self.data), dtype=np.uint8).reshape(-1, MAX_PAYLOAD)
+        return out
+
+
+def decode_frame(columns: FrameColumns, obj_type: int, timestamp: float, buf, pos: int, obj_pos: int) -> bool:
+    """
+    Append one CAN / CAN FD object to `columns` given its body offset `pos` and
+    object offset `obj_pos`; returns False for other object types.
+    """
+    if obj_type == CAN_MESSAGE or obj_type == CAN_MESSAGE2:
+        channel, msg_flags, dlc, can_id, payload = CAN_MESSAGE_STRUCT.unpack_from(buf, pos)
+        flags = (FRAME_TX if msg_flags & 0x01 else 0) | (FRAME_REMOTE if msg_flags & 0x80 else 0)
+        length = min(dlc, 8)
+    elif obj_type == CAN_FD_MESSAGE:
+        channel, msg_flags, dlc, can_id, _, _, fd_flags, length, payload = CAN_FD_MESSAGE_STRUCT.unpack_from(buf, pos)
+        flags = ((FRAME_TX if msg_flags & 0x01 else 0) | (FRAME_REMOTE if msg_flags & 0x80 else 0)
+                 | (FRAME_FD if fd_flags & 0x01 else 0) | (FRAME_BRS if fd_flags & 0x02 else 0)
+                 | (FRAME_ESI if fd_flags & 0x04 else 0))
+    elif obj_type == CAN_FD_MESSAGE_64:
+        (channel, dlc, length, _, can_id, _, fd_flags, _, _, _, _, _, direction, ext_data_offset, _
+         ) = CAN_FD_MESSAGE_64_STRUCT.unpack_from(buf, pos)
+        start = pos + CAN_FD_MESSAGE_64_STRUCT.size
+        # Data ends where the extended data starts (or with the object); `length` may claim
+        # more, the missing bytes then read as zero like in CANoe
+        data_end = obj_pos + (ext_data_offset or OBJ_HEADER_BASE.unpack_from(buf, obj_pos)[3])
+        payload = bytes(buf[start:min(start + length, data_end)])
+        flags = ((FRAME_TX if direction else 0) | (FRAME_REMOTE if fd_flags & 0x0010 else 0)
+                 | (FRAME_FD if fd_flags & 0x1000 else 0) | (FRAME_BRS if fd_flags & 0x2000 else 0)
+                 | (FRAME_ESI if fd_flags & 0x4000 else 0))
+    else:
+        return False
+    if can_id & CAN_MSG_EXT:
+        flags |= FRAME_EXTENDED
+    columns.append(timestamp, channel, can_id & ~CAN_MSG_EXT, dlc, min(length, MAX_PAYLOAD), flags, obj_type, payload)
+    return True
+
+
+def iter_blf_batches(path: str, chunk_size: int = DEFAULT_CHUNK_FRAMES) -> Iterator[np.ndarray]:
+    """
+    Yield CAN / CAN FD frames of a BLF file as structured arrays of BLF_FRAME_DTYPE,
+    at most `chunk_size` rows each. Pure struct/zlib parsing – no backend needed –
+    and only one container plus one chunk is held in memory at a time.
+    Other object types are skipped.
+    """
+    columns = FrameColumns(chunk_size)
+    with open(path, "rb") as f:
+        for obj in iter_blf_objects(iter_blf_blocks(f)):
+            if decode_frame(columns, *obj) and len(columns) >= chunk_size:
+                yield columns.to_array()
+                columns.clear()
+    if len(columns):
+        yield columns.to_array()
+
+
+# ---------------------------------------------------------------------------
+# Parallel decoding across container ranges
+# ---------------------------------------------------------------------------
+
+DEFAULT_CONTAINERS_PER_TASK = 64
+OBJECT_HEADER_SIZES = {1: OBJ_HEADER_BASE.size + OBJ_HEADER_V1.size, 2: OBJ_HEADER_BASE.size + OBJ_HEADER_V2.size}
+
+_BLF_OFFSETS: List[int] = []         # container offsets, handed to each worker once
+
+
+def _init_blf_worker(offsets: List[int]):
+    global _BLF_OFFSETS
+    _BLF_OFFSETS = offsets
+
+
+def is_blf_object_start(data, pos: int) -> bool:
+    """Plausible object header at `pos`, and the object after it starts with LOBJ too (if inside `data`)."""
+    if pos + OBJ_HEADER_BASE.size > len(data):
+        return False
+    signature, header_size, header_version, obj_size, obj_type = OBJ_HEADER_BASE.unpack_from(data, pos)
+    if signature != BLF_OBJ_SIGNATURE or OBJECT_HEADER_SIZES.get(header_version) != header_size:
+        return False
+    if obj_size < header_size:
+        return False
+    next_pos = pos + obj_size + (0 if obj_type == CAN_FD_MESSAGE_64 else obj_size % 4)
+    return next_pos + 4 > len(data) or _find_next_object(data, next_pos) is not None
+
+
+def find_blf_object_start(data, pos: int = 0):
+    """Offset of the first object header in container data that may begin mid-object, or None."""
+    while True:
+        pos = data.find(BLF_OBJ_SIGNATURE, pos)
+        if pos < 0 or is_blf_object_start(data, pos):
+            return None if pos < 0 else pos
+        pos += 1
+
+
+def _iter_range_objects(f, offsets, start, last, end):
+    """
+    Objects that start in containers [start[0], last), the first at byte start[1].
+    An object spilling past `last` is finished from the following containers.
+    end[0] is set to the (container, offset) where the next object starts.
+    """
+    index, skip = start
+    end[0] = start
+    if index >= last:
+        return
+    tail = b""
+    while index < len(offsets):
+        data, _ = read_blf_block(f, offsets[index])
+        buf = tail + data[skip:] if tail else data[skip:]
+        finishing = index >= last
+        pos = yield from split_blf_objects(buf, 1 if finishing else None)
+        consumed = skip + pos - len(tail)       # offset in this container's data
+        tail, skip = buf[pos:], 0
+        if finishing and pos:
+            end[0] = (index, consumed) if consumed < len(data) else (index + 1, 0)
+            return
+        index += 1
+        if index >= last and not tail:
+            end[0] = (index, 0)
+            return
+    end[0] = (index, 0)                        # truncated file
+
+
+def decode_blf_range(path: str, first: int, last: int, start=None, offsets: List[int] = None):
+    """
+    Decode the frames of objects starting in containers [first, last).
+    Unless `start` (container, offset) is given, the first object is found by
+    resynchronising on an LOBJ header in container `first`.
+    Returns (start, end, frames) – start and end as (container, offset) so the
+    caller can check that neighbouring ranges meet exactly.
+    """
+    offsets = offsets if offsets is not None else _BLF_OFFSETS
+    columns = FrameColumns()
+    end = [None]
+    with open(path, "rb") as f:
+        if start is None and first == 0:
+            start = (0, 0)
+        elif start is None:
+            start = (last, 0)                  # no object starts inside this range
+            for index in range(first, last):
+                skip = find_blf_object_start(read_blf_block(f, offsets[index])[0])
+                if skip is not None:
+                    start = (index, skip)
+                    break
+        for obj in _iter_range_objects(f, offsets, start, last, end):
+            decode_frame(columns, *obj)
+    return start, end[0], columns.to_array()
+
+
+def iter_blf_batches_parallel(path: str, workers: int = None, chunk_size: int = DEFAULT_CHUNK_FRAMES,
+                              containers_per_task: int = DEFAULT_CONTAINERS_PER_TASK) -> Iterator[np.ndarray]:
+    """
+    Like iter_blf_batches, but ranges of containers are decompressed and decoded
+    by a process pool. Each range must start exactly where the previous one
+    ended; if a worker resynchronised elsewhere (e.g. on an "LOBJ" inside a
+    payload) that range is decoded again in-process from the right position.
+    Frames are merged in timestamp order: rows are held back until no later
+    range starts before them. Memory is bounded by 2 × workers ranges in flight.
+    """
+    offsets = scan_blf_offsets(path)
+    ranges = iter([(i, min(i + containers_per_task, len(offsets)))
+                   for i in range(0, len(offsets), containers_per_task)])
+    workers = workers or os.cpu_count() or 1
+    pending = np.empty(0, dtype=BLF_FRAME_DTYPE)
+    prev_end = (0, 0)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_blf_worker, initargs=(offsets,)) as pool:
+        in_flight = deque()
+
+        def submit_next():
+            task = next(ranges, None)
+            if task is not None:
+                in_flight.append((task, pool.submit(decode_blf_range, path, *task)))
+
+        for _ in range(workers * 2):
+            submit_next()
+        while in_flight:
+            (first, last), future = in_flight.popleft()
+            submit_next()
+            start, end, frames = future.result()
+            if start != prev_end:
+                print(f"⚠️  containers {first}–{last}: worker resynced at {start}, expected {prev_end}; "
+                      f"decoding sequentially")
+                start, end, frames = decode_blf_range(path, first, last, start=prev_end, offsets=offsets)
+            prev_end = end
+            if not len(frames):
+                continue
+            pending = np.concatenate([pending, frames])
+            pending = pending[np.argsort(pending["timestamp"], kind="stable")]
+            cut = np.searchsorted(pending["timestamp"], frames["timestamp"].min(), side="left")
+            for i in range(0, cut, chunk_size):
+                yield pending[i:min(i + chunk_size, cut)]
+            pending = pending[cut:]
+
+    for i in range(0, len(pending), chunk_size):
+        yield pending[i:i + chunk_size]
+
+
+# ---------------------------------------------------------------------------
+# Sidecar time index and time-window reads
+# ---------------------------------------------------------------------------
+
+BLF_INDEX_FORMAT = 1
+
+
+def blf_index_path(path: str) -> str:
+    return path + ".idx.json"
+
+
+def _source_stamp(path: str) -> dict:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _decode_split(columns: FrameColumns, buf, max_objects: int = None) -> int:
+    """decode_frame every object split_blf_objects finds in `buf`; returns its end offset."""
+    objects = split_blf_objects(buf, max_objects)
+    while True:
+        try:
+            decode_frame(columns, *next(objects))
+        except StopIteration as stop:
+            return stop.value
+
+
+class _FrameSummary:
+    """Frame counts and first/last timestamps per (channel, arbitration id)."""
+
+    def __init__(self):
+        self.ids = {}              # (channel, id) -> [frames, first, last]
+
+    def add(self, frames: np.ndarray):
+        if not len(frames):
+            return
+        keys = (frames["channel"].astype(np.uint64) << np.uint64(32)) | frames["arbitration_id"]
+        unique, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        first = np.full(len(unique), np.inf)
+        last = np.full(len(unique), -np.inf)
+        np.minimum.at(first, inverse, frames["timestamp"])
+        np.maximum.at(last, inverse, frames["timestamp"])
+        for key, count, lo, hi in zip(unique.tolist(), counts.tolist(), first.tolist(), last.tolist()):
+            entry = self.ids.setdefault((key >> 32, key & 0xFFFFFFFF), [0, lo, hi])
+            entry[0] += count
+            entry[1] = min(entry[1], lo)
+            entry[2] = max(entry[2], hi)
+
+    def to_json(self) -> dict:
+        per_bus = {}
+        for (channel, can_id), (count, lo, hi) in self.ids.items():
+            bus = per_bus.setdefault(f"CAN{channel}", {"frames": 0, "ids": 0, "first": lo, "last": hi})
+            bus["frames"] += count
+            bus["ids"] += 1
+            bus["first"] = min(bus["first"], lo)
+            bus["last"] = max(bus["last"], hi)
+        per_id = [
+            {"channel": channel, "id": can_id, "frames": count, "first": lo, "last": hi}
+            for (channel, can_id), (count, lo, hi) in sorted(self.ids.items())
+        ]
+        return {"per_bus": per_bus, "per_id": per_id}
+
+
+def build_blf_index(path: str) -> dict:
+    """
+    One sequential pass over a BLF file. Records, per container, its file
+    offset, where the first object starting in it begins ("start", None if an
+    object spans the whole container) and the time range of the frames
+    starting in it, plus per-bus and per-ID summaries. Written next to the log
+    as <file>.idx.json.
+    """
+    offsets = scan_blf_offsets(path)
+    containers, summary = [], _FrameSummary()
+    prev = None                         # (entry, columns) of the container whose last object may spill over
+
+    def close(entry, columns):
+        frames = columns.to_array()
+        entry["frames"] = len(frames)
+        if len(frames):
+            entry["t_min"] = float(frames["timestamp"].min())
+            entry["t_max"] = float(frames["timestamp"].max())
+        summary.add(frames)
+
+    with open(path, "rb") as f:
+        tail = b""
+        for offset in offsets:
+            data, _ = read_blf_block(f, offset)
+            skip = 0
+            if tail:
+                buf = tail + data
+                pos = _decode_split(prev[1], buf, 1)      # the spilled object belongs to the previous container
+                if not pos:
+                    tail = buf
+                    containers.append({"offset": offset, "start": None, "frames": 0})
+                    continue
+                skip = pos - len(tail)
+            if prev is not None:
+                close(*prev)
+            columns = FrameColumns()
+            buf = data[skip:]
+            tail = buf[_decode_split(columns, buf):]
+            entry = {"offset": offset, "start": skip}
+            containers.append(entry)
+            prev = (entry, columns)
+        if prev is not None:
+            close(*prev)
+
+    index = {"format": BLF_INDEX_FORMAT, "kind": "blf", "source": _source_stamp(path),
+             "containers": containers, **summary.to_json()}
+    tmp_path = blf_index_path(path) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, blf_index_path(path))
+    return index
+
+
+def load_blf_index(path: str, build: bool = True):
+    """The sidecar index of `path` if it is current, else a freshly built one (or None if build=False)."""
+    try:
+        with open(blf_index_path(path)) as f:
+            index = json.load(f)
+        if index.get("format") == BLF_INDEX_FORMAT and index.get("source") == _source_stamp(path):
+            return index
+    except (OSError, ValueError):
+        pass
+    return build_blf_index(path) if build else None
+
+
+def read_blf_window(path: str, start: float, end: float,
+                    chunk_size: int = DEFAULT_CHUNK_FRAMES) -> Iterator[np.ndarray]:
+    """
+    Frames with start <= timestamp <= end, in chunks of BLF_FRAME_DTYPE. Uses the
+    sidecar index to seek straight to the containers whose time range overlaps
+    the window and decodes only those (contiguous runs share one decode).
+    """
+    index = load_blf_index(path)
+    containers = index["containers"]
+    offsets = [c["offset"] for c in containers]
+    hits = [i for i, c in enumerate(containers)
+            if c["start"] is not None and c.get("frames") and c["t_min"] <= end and c["t_max"] >= start]
+
+    runs = []
+    for i in hits:
+        if runs and runs[-1][1] == i:
+            runs[-1][1] = i + 1
+        else:
+            runs.append([i, i + 1])
+    for first, last in runs:
+        _, _, frames = decode_blf_range(path, first, last, start=(first, containers[first]["start"]),
+                                        offsets=offsets)
+        ts = frames["timestamp"]
+        frames = frames[(ts >= start) & (ts <= end)]
+        for i in range(0, len(frames), chunk_size):
+            yield frames[i:i + chunk_size]
+
+
+# ---------------------------------------------------------------------------
+# Vectorised DBC signal decoding
+# ---------------------------------------------------------------------------
+
+DBC_MESSAGE_RE = re.compile(r'^BO_\s+(\d+)\s+(\w+)\s*:\s*(\d+)\s+(\w+)')
+DBC_SIGNAL_RE = re.compile(
+    r'^SG_\s+(\w+)\s*(M|m\d+M?)?\s*:\s*(\d+)\|(\d+)@([01])([+-])\s*'
+    r'\(\s*([^,]+?)\s*,\s*([^)]+?)\s*\)\s*\[[^\]]*\]\s*"([^"]*)"'
+)
+
+
+@dataclass
+class DbcSignal:
+    name: str
+    start: int                     # DBC start bit (LSB for Intel, MSB for Motorola)
+    length: int
+    big_endian: bool               # @0 = Motorola
+    signed: bool
+    scale: float
+    offset: float
+    unit: str = ""
+    is_multiplexer: bool = False
+    mux_value: int | None = None   # set for signals only present for one multiplexer value
+
+    def layout(self):
+        """(first byte, right shift, last byte) of the signal inside an 8-byte word read from first byte."""
+        if self.big_endian:
+            msb = (self.start // 8) * 8 + 7 - self.start % 8      # bit position counted from byte 0's MSB
+            lsb = msb + self.length - 1
+            first_byte = msb // 8
+            return first_byte, 64 - (lsb - 8 * first_byte + 1), lsb // 8
+        first_byte = self.start // 8
+        return first_byte, self.start - 8 * first_byte, (self.start + self.length - 1) // 8
+
+
+@dataclass
+class DbcMessage:
+    frame_id: int                  # as written in the DBC: bit 31 set for extended IDs
+    name: str
+    dlc: int
+    signals: List[DbcSignal] = field(default_factory=list)
+
+
+def load_dbc(path: str) -> Dict[int, DbcMessage]:
+    """BO_ / SG_ definitions of a DBC file, keyed by DBC frame id. Everything else is ignored."""
+    messages, current = {}, None
+    with open(path, encoding="latin-1") as f:
+        for line in f:
+            line = line.strip()
+            m = DBC_MESSAGE_RE.match(line)
+            if m:
+                current = DbcMessage(int(m.group(1)), m.group(2), int(m.group(3)))
+                messages[current.frame_id] = current
+                continue
+            m = DBC_SIGNAL_RE.match(line)
+            if m and current is not None:
+                name, mux, start, length, order, sign, scale, offset, unit = m.groups()
+                current.signals.append(DbcSignal(
+                    name=name, start=int(start), length=int(length), big_endian=order == "0",
+                    signed=sign == "-", scale=float(scale), offset=float(offset), unit=unit,
+                    is_multiplexer=mux == "M",
+                    mux_value=int(mux[1:].rstrip("M")) if mux and mux.startswith("m") else None,
+                ))
+            elif not line.startswith("SG_"):
+                current = None
+    return messages
+
+
+class DecodePlan:
+    """
+    Precomputed extraction for one message: per signal the byte at which an
+    8-byte word is read, the shift and mask inside that word, sign handling and
+    scale/offset. decode() works on all frames of the message in a batch at once.
+    """
+
+    def __init__(self, message: DbcMessage):
+        self.message = message
+        self.multiplexer = next((sig for sig in message.signals if sig.is_multiplexer), None)
+        self.steps = []
+        for sig in message.signals:
+            first_byte, shift, last_byte = sig.layout()
+            if shift < 0 or last_byte - first_byte >= 8 or sig.length > 64:
+                print(f"⚠️  {message.name}.{sig.name}: spans more than 8 bytes – skipped")
+                continue
+            mask = np.uint64((1 << sig.length) - 1)
+            self.steps.append((sig, f"{message.name}.{sig.name}", first_byte, np.uint64(shift), mask, last_byte))
+
+    @staticmethod
+    def _words(data: np.ndarray, first_byte: int, big_endian: bool) -> np.ndarray:
+        window = np.zeros((len(data), 8), dtype=np.uint8)
+        avail = data[:, first_byte:first_byte + 8]
+        window[:, :avail.shape[1]] = avail
+        return window.view(">u8" if big_endian else "<u8").ravel().astype(np.uint64)
+
+    def decode(self, frames: np.ndarray, out: "SignalSeries"):
+        data, ts, length = frames["data"], frames["timestamp"], frames["length"]
+        words, raws = {}, {}
+        for sig, qualified, first_byte, shift, mask, _ in self.steps:
+            key = (first_byte, sig.big_endian)
+            if key not in words:
+                words[key] = self._words(data, first_byte, sig.big_endian)
+            raws[sig.name] = (words[key] >> shift) & mask
+
+        mux = raws.get(self.multiplexer.name) if self.multiplexer else None
+        for sig, qualified, _, _, _, last_byte in self.steps:
+            valid = length > last_byte
+            if sig.mux_value is not None:
+                if mux is None:
+                    continue
+                valid &= mux == sig.mux_value
+            if not valid.any():
+                continue
+            raw = raws[sig.name][valid]
+            if sig.signed:
+                # move the sign bit to bit 63, then shift back arithmetically (exact for any length)
+                unused = 64 - sig.length
+                values = (raw << np.uint64(unused)).view(np.int64) >> np.int64(unused)
+            else:
+                values = raw
+            out.add(qualified, ts[valid], values * sig.scale + sig.offset)
+
+
+class SignalSeries:
+    """Per-signal time series collected over many batches."""
+
+    def __init__(self):
+        self._parts = defaultdict(list)
+
+    def add(self, name: str, timestamps: np.ndarray, values: np.ndarray):
+        self._parts[name].append((timestamps, values))
+
+    def arrays(self) -> Dict[str, tuple]:
+        """name -> (timestamps, physical values), each one float64 array."""
+        return {
+            name: (np.concatenate([t for t, _ in parts]), np.concatenate([v for _, v in parts]).astype(np.float64))
+            for name, parts in self._parts.items()
+        }
+
+
+def compile_decode_plans(messages: Dict[int, DbcMessage]) -> Dict[int, DecodePlan]:
+    return {frame_id: DecodePlan(message) for frame_id, message in messages.items()}
+
+
+def decode_batch(frames: np.ndarray, plans: Dict[int, DecodePlan], out: SignalSeries):
+    """Group a BLF_FRAME_DTYPE batch by DBC frame id (one stable sort) and run each message's plan on its rows."""
+    if not len(frames):
+        return
+    keys = frames["arbitration_id"] | ((frames["flags"] & FRAME_EXTENDED).astype(np.uint32) << np.uint32(31))
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(sorted_keys)) + 1, [len(order)]))
+    for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        plan = plans.get(int(sorted_keys[lo]))
+        if plan is not None:
+            plan.decode(frames[order[lo:hi]], out)
+
+
+def decode_signals(batches: Iterable[np.ndarray], dbc_path: str) -> Dict[str, tuple]:
+    """Decode every DBC signal from a stream of frame batches into per-signal (timestamps, values) arrays."""
+    plans = compile_decode_plans(load_dbc(dbc_path))
+    out = SignalSeries()
+    for frames in batches:
+        decode_batch(frames, plans, out)
+    return out.arrays()
+
+
+def limit_frames(batches: Iterable[np.ndarray], limit: int) -> Iterator[np.ndarray]:
+    """Pass frame batches through until `limit` frames in total (0 = no limit), cutting the last one."""
+    total = 0
+    for batch in batches:
+        if limit:
+            batch = batch[:limit - total]
+        total += len(batch)
+        yield batch
+        if limit and total >= limit:
+            return
+
+
 def public_attrs(obj) -> List[str]:
     "Return a list of attribute names that don't start with '_'"
     return [a for a in dir(obj) if not a.startswith('_')]
@@ -57,8 +815,57 @@ def main():
     ap.add_argument("blf", help="Path to .blf file")
     ap.add_argument("--limit", type=int, default=0,
                     help="Stop after N frames (0 = no limit)")
+    ap.add_argument("--columnar", action="store_true",
+                    help="Decode CAN / CAN FD natively into NumPy chunks and print per-chunk summaries")
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_FRAMES,
+                    help="Frames per columnar chunk")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="Columnar mode: decode container ranges in N processes (0 = CPU count)")
+    ap.add_argument("--dbc", default=None,
+                    help="Columnar mode: decode the frames with this DBC and print per-signal summaries")
+    ap.add_argument("--build-index", action="store_true",
+                    help="(Re)build the <file>.idx.json sidecar and print its bus summary")
+    ap.add_argument("--start", type=float, default=None,
+                    help="Columnar mode: only frames at or after this time (s), via the sidecar index")
+    ap.add_argument("--end", type=float, default=None,
+                    help="Columnar mode: only frames at or before this time (s), via the sidecar index")
     args = ap.parse_args()
 
+    if args.build_index:
+        index = build_blf_index(args.blf)
+        for bus, info in sorted(index["per_bus"].items()):
+            print(f"{bus:8} frames={info['frames']:10d}  ids={info['ids']:5d}  "
+                  f"{info['first']:.6f}–{info['last']:.6f} s")
+        print(f"📇 {len(index['containers'])} containers indexed → {blf_index_path(args.blf)}")
+        return
+
+    if args.columnar:
+        total = 0
+        if args.start is not None or args.end is not None:
+            batches = read_blf_window(args.blf,
+                                      args.start if args.start is not None else float("-inf"),
+                                      args.end if args.end is not None else float("inf"),
+                                      args.chunk_size)
+        elif args.workers == 1:
+            batches = iter_blf_batches(args.blf, args.chunk_size)
+        else:
+            batches = iter_blf_batches_parallel(args.blf, args.workers or None, args.chunk_size)
+        batches = limit_frames(batches, args.limit)
+        if args.dbc:
+            for name, (ts, values) in sorted(decode_signals(batches, args.dbc).items()):
+                print(f"{name:40} samples={len(values):9d}  "
+                      f"min={values.min():.6g}  max={values.max():.6g}  "
+                      f"{ts[0]:.6f}–{ts[-1]:.6f} s")
+            return
+        for batch in batches:
+            total += len(batch)
+            ts = batch["timestamp"]
+            print(f"[{total:>10}] {len(batch):7d} frames  "
+                  f"{ts.min():.6f}–{ts.max():.6f} s  "
+                  f"ids={len(np.unique(batch['arbitration_id']))}  "
+                  f"fd={int(np.count_nonzero(batch['flags'] & FRAME_FD))}")
+        return
+
     for i, (ftype, obj) in enumerate(iter_blf(args.blf), 1):
         attrs = public_attrs(obj)
         print(f"[{i:>6}] {ftype:12}  attrs={attrs[:8]}{' …' if len(attrs) > 8 else ''}")
@@ -82,10 +889,14 @@ Usage:
 """
 
 import argparse
+import json
+import os
+from bisect import bisect_right
 from datetime import datetime
 from pathlib import Path
 
-from asammdf import MDF, Signal
+import numpy as np
+from asammdf import MDF
 
 BUS_TAGS = {
     "CAN":     ("CAN_", "CAN "),     # CAN/CAN FD
@@ -94,6 +905,10 @@ BUS_TAGS = {
     "ETH":     ("ETH", "ETHERNET"),  # SOME-IP / raw Eth
 }
 
+def channel_group_name(group) -> str:
+    return group.channel_group.acq_name or ""
+
+
 def guess_bus(channel_group_name: str) -> str | None:
     upper = channel_group_name.upper()
     for bus, prefixes in BUS_TAGS.items():
@@ -103,26 +918,157 @@ def guess_bus(channel_group_name: str) -> str | None:
 
 
 def scan_mf4(path: Path, limit: int | None = None):
+    """
+    Metadata-only channel inventory: sample counts come from each channel
+    group's cycle count and the time span from the first and last master
+    records, so no channel data is loaded.
+    """
     with MDF(path, memory="minimal") as mdf:          # <—— no full file in RAM
-        for cg_index, cg in enumerate(mdf.groups, start=1):
-            bus = guess_bus(cg.name or "")
-            for ch_index, ch in enumerate(cg.channels, start=1):
-                sig: Signal = mdf.get_signal(ch)      # lazy – data not loaded yet
-                start, stop = sig.timestamps[[0, -1]]
+        for cg_index, group in enumerate(mdf.groups, start=1):
+            bus = guess_bus(channel_group_name(group))
+            cycles = group.channel_group.cycles_nr
+            if cycles:
+                start = mdf.get_master(cg_index - 1, record_offset=0, record_count=1)[0]
+                stop = mdf.get_master(cg_index - 1, record_offset=cycles - 1, record_count=1)[0]
+                span = (f"{datetime.utcfromtimestamp(start):%H:%M:%S.%f}–"
+                        f"{datetime.utcfromtimestamp(stop):%H:%M:%S.%f}")
+            else:
+                span = "—"
+            for ch_index, ch in enumerate(group.channels, start=1):
                 print(f"[CG{cg_index:03}.{ch_index:04}] "
-                      f"{sig.name:30} "
-                      f"({sig.unit or '—':8})  "
-                      f"samples={len(sig):7d}  "
-                      f"{datetime.utcfromtimestamp(start):%H:%M:%S.%f}–"
-                      f"{datetime.utcfromtimestamp(stop):%H:%M:%S.%f}  "
+                      f"{ch.name:30} "
+                      f"({ch.unit or '—':8})  "
+                      f"samples={cycles:7d}  "
+                      f"{span}  "
                       f"{bus or ''}")
-                if limit and cg_index >= limit:
-                    return
+            if limit and cg_index >= limit:
+                return
+
+
+# ---------------------------------------------------------------------------
+# Sidecar time index and time-window reads
+# ---------------------------------------------------------------------------
+
+MF4_INDEX_FORMAT = 1
+MF4_INDEX_STRIDE = 4096          # records between sampled master timestamps
+
+
+def mf4_index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".idx.json")
+
+
+def _source_stamp(path: Path) -> dict:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _id_summary(master, ids) -> list:
+    unique, inverse, counts = np.unique(ids, return_inverse=True, return_counts=True)
+    first = np.full(len(unique), np.inf)
+    last = np.full(len(unique), -np.inf)
+    np.minimum.at(first, inverse, master)
+    np.maximum.at(last, inverse, master)
+    return [{"id": int(i), "frames": int(n), "first": float(lo), "last": float(hi)}
+            for i, n, lo, hi in zip(unique, counts, first, last)]
+
+
+def build_mf4_index(path: Path, stride: int = MF4_INDEX_STRIDE) -> dict:
+    """
+    Sample every channel group's master channel each `stride` records (plus the
+    last record) so a time window maps to a record range without reading the
+    data before it. Also records per-bus totals and, for ASAM bus-logging groups
+    (a "…DataFrame.ID" channel), per-ID frame counts. Written as <file>.idx.json.
+    """
+    groups, per_bus = [], {}
+    with MDF(path, memory="minimal") as mdf:
+        for g, group in enumerate(mdf.groups):
+            name = channel_group_name(group)
+            bus = guess_bus(name)
+            cycles = group.channel_group.cycles_nr
+            records = list(range(0, cycles, stride))
+            if cycles and records[-1] != cycles - 1:
+                records.append(cycles - 1)
+            samples = [[r, float(mdf.get_master(g, record_offset=r, record_count=1)[0])] for r in records]
+            entry = {"group": g, "name": name, "bus": bus, "cycles": cycles, "samples": samples}
+
+            if bus and samples:
+                totals = per_bus.setdefault(bus, {"groups": 0, "records": 0,
+                                                  "first": samples[0][1], "last": samples[-1][1]})
+                totals["groups"] += 1
+                totals["records"] += cycles
+                totals["first"] = min(totals["first"], samples[0][1])
+                totals["last"] = max(totals["last"], samples[-1][1])
+                id_channels = [ch.name for ch in group.channels if ch.name.endswith("DataFrame.ID")]
+                if id_channels:
+                    ids, _ = mdf.get(id_channels[0], group=g, samples_only=True)
+                    entry["per_id"] = _id_summary(mdf.get_master(g), ids)
+            groups.append(entry)
+
+    index = {"format": MF4_INDEX_FORMAT, "kind": "mf4", "source": _source_stamp(path),
+             "stride": stride, "groups": groups, "per_bus": per_bus}
+    tmp_path = mf4_index_path(path).with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(index))
+    os.replace(tmp_path, mf4_index_path(path))
+    return index
+
+
+def load_mf4_index(path: Path, build: bool = True):
+    """The sidecar index of `path` if it is current, else a freshly built one (or None if build=False)."""
+    try:
+        index = json.loads(mf4_index_path(path).read_text())
+        if index.get("format") == MF4_INDEX_FORMAT and index.get("source") == _source_stamp(path):
+            return index
+    except (OSError, ValueError):
+        pass
+    return build_mf4_index(path) if build else None
+
+
+def record_range(samples: list, cycles: int, start: float, end: float):
+    """[first, stop) records of a group that cover start..end, from its sampled master timestamps."""
+    times = [t for _, t in samples]
+    lo = bisect_right(times, start) - 1
+    hi = bisect_right(times, end)
+    first = samples[lo][0] if lo >= 0 else 0
+    stop = samples[hi][0] if hi < len(samples) else cycles
+    return first, stop
+
+
+def read_mf4_window(path: Path, start: float, end: float):
+    """
+    Yield (group index, Signal) for every channel, limited to start..end. Only the
+    records the sidecar index maps to the window are read from each group.
+    """
+    index = load_mf4_index(path)
+    with MDF(path, memory="minimal") as mdf:
+        for entry in index["groups"]:
+            if not entry["samples"] or entry["samples"][0][1] > end or entry["samples"][-1][1] < start:
+                continue
+            first, stop = record_range(entry["samples"], entry["cycles"], start, end)
+            g = entry["group"]
+            for c in range(len(mdf.groups[g].channels)):
+                sig = mdf.get(group=g, index=c, record_offset=first, record_count=stop - first)
+                yield g, sig.cut(start, end)
 
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("mf4", type=Path, help="Path to .mf4 file")
     ap.add_argument("--limit", type=int, help="Stop after N channel-groups")
+    ap.add_argument("--build-index", action="store_true",
+                    help="(Re)build the <file>.idx.json sidecar and print its bus summary")
+    ap.add_argument("--start", type=float, default=None, help="Only samples at or after this time (s)")
+    ap.add_argument("--end", type=float, default=None, help="Only samples at or before this time (s)")
     args = ap.parse_args()
-    scan_mf4(args.mf4, args.limit)
+    if args.build_index:
+        index = build_mf4_index(args.mf4)
+        for bus, info in sorted(index["per_bus"].items()):
+            print(f"{bus:8} groups={info['groups']:4d}  records={info['records']:10d}  "
+                  f"{info['first']:.6f}–{info['last']:.6f} s")
+        print(f"📇 {len(index['groups'])} channel groups indexed → {mf4_index_path(args.mf4)}")
+    elif args.start is not None or args.end is not None:
+        window_start = args.start if args.start is not None else float("-inf")
+        window_end = args.end if args.end is not None else float("inf")
+        for g, sig in read_mf4_window(args.mf4, window_start, window_end):
+            print(f"[CG{g + 1:03}] {sig.name:30} samples={len(sig):7d}")
+    else:
+        scan_mf4(args.mf4, args.limit)
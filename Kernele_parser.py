@@ -1,162 +1,606 @@
 import os
 import re
+import shutil
 import subprocess
 from collections import defaultdict
 from django.db import transaction
-from your_app.models import KernelVersion, CFile, Config, KernelConfig
+from django.db.models import F
+from kernel_analysis.kernel_cache import KernelSourceCache
+from kernel_analysis.kernel_index import clear_kernel_config_index
+from kernel_analysis.kernel_snapshot import remove_kernel_index_snapshot
+from kernel_analysis.makefile_parser import makefile_hash, parse_makefile, parse_makefile_texts
+from your_app.models import KernelVersion, CFile, Config, KernelConfig, FunctionSymbol, ParsedMakefile
 
 KERNEL_CACHE_DIR = "/tmp/linux-kernels"
+kernel_source_cache = KernelSourceCache(KERNEL_CACHE_DIR)
+DEFAULT_BATCH_SIZE = 5000
 
+# Function definitions as written in kernel style: name at column 0 (optionally
+# after the return type on the same or previous line), parameters, then the body.
+func_def_pattern = re.compile(
+    r'^(?:[A-Za-z_][\w \t*]*[ \t*]|[A-Za-z_][\w \t*]*\n)?'
+    r'([A-Za-z_]\w*)\s*\([^;{}]*\)\s*\{',
+    re.MULTILINE
+)
+C_KEYWORDS = {"if", "for", "while", "switch", "return", "sizeof", "else", "do"}
 
-def download_and_extract_kernel(version: str) -> str:
-    short_version = ".".join(version.split(".")[:2])
-    target_dir = os.path.join(KERNEL_CACHE_DIR, short_version)
-    if os.path.exists(target_dir):
-        return target_dir
 
-    os.makedirs(KERNEL_CACHE_DIR, exist_ok=True)
-    print(f"Cloning kernel version {short_version} ...")
+def _fetch_kernel_git(version: str, staging_dir: str) -> str:
+    """Shallow-clone the stable tag of exactly `version` (not just its major.minor)."""
+    target_dir = os.path.join(staging_dir, f"linux-{version}")
+    print(f"Cloning kernel version {version} ...")
     subprocess.run([
         "git", "clone",
         "--depth", "1",
-        "--branch", f"v{short_version}",
+        "--branch", f"v{version}",
         "https://git.kernel.org/pub/scm/linux/kernel/git/stable/linux.git",
         target_dir
     ], check=True)
-
+    shutil.rmtree(os.path.join(target_dir, ".git"), ignore_errors=True)
     return target_dir
 
 
-def preprocess_lines(lines):
-    new_lines = []
-    continuation = ''
-    for line in lines:
-        line = line.rstrip()
-        if line.endswith('\\'):
-            continuation += line[:-1] + ' '
-        else:
-            new_lines.append((continuation + line).strip())
-            continuation = ''
-    return new_lines
+def extract_function_symbols(source: str) -> set:
+    """Names of the functions defined in one C source file."""
+    return {name for name in func_def_pattern.findall(source) if name not in C_KEYWORDS}
+
+
+def index_function_symbols(source, kernel_version_obj, cfiles: dict, batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    Record which built C file defines which function, so CVE descriptions that
+    name a function resolve to its source file with one lookup.
+    `source` is a KernelSourceTree or StreamedKernelSource,
+    `cfiles` maps kernel-relative path -> CFile.
+    """
+    FunctionSymbol.objects.filter(kernel_version=kernel_version_obj).delete()
+    symbols = []
+    for rel_path, cfile_obj in cfiles.items():
+        symbols.extend(
+            FunctionSymbol(kernel_version=kernel_version_obj, name=name, cfile=cfile_obj)
+            for name in source.function_symbols(rel_path)
+        )
+    FunctionSymbol.objects.bulk_create(symbols, batch_size=batch_size, ignore_conflicts=True)
+    print(f"[🔎] Indexed {len(symbols)} function symbols in {len(cfiles)} C files")
+
+
+def _chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def cfiles_by_path(paths, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    cfiles = {}
+    for chunk in _chunked(sorted(paths), batch_size):
+        cfiles.update((cfile.path, cfile) for cfile in CFile.objects.filter(path__in=chunk))
+    return cfiles
 
 
 @transaction.atomic
-def parse_makefiles_and_save(version: str):
-    root_dir = download_and_extract_kernel(version)
-    kernel_version_obj, _ = KernelVersion.objects.get_or_create(version=version)
+def save_kernel_edges(kernel_version_obj, edges: set, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """
+    Bulk-write the (config, C file path) edges of one kernel version.
+    Missing CFile / Config rows are inserted first, then all KernelConfig rows,
+    each with bulk_create(ignore_conflicts=True) in `batch_size` chunks.
+    Returns kernel-relative path -> CFile for every file in `edges`.
+    """
+    paths = sorted({path for _, path in edges})
+    config_names = sorted({config for config, _ in edges})
+
+    CFile.objects.bulk_create(
+        [CFile(path=path, name=os.path.basename(path)) for path in paths],
+        batch_size=batch_size, ignore_conflicts=True
+    )
+    Config.objects.bulk_create(
+        [Config(name=name) for name in config_names],
+        batch_size=batch_size, ignore_conflicts=True
+    )
 
-    # Regex patterns
-    obj_line_pattern = re.compile(r'obj-[^=]+\s*\+=\s*(.*)')
-    config_ref_pattern = re.compile(r'\$\((CONFIG_[A-Z0-9_]+)\)')
-    group_assign_pattern = re.compile(r'([a-zA-Z0-9_.-]+)-objs\s*[:+]?=\s*(.*)')
-    ifdef_pattern = re.compile(r'^\s*ifdef\s+(CONFIG_[A-Z0-9_]+)')
-    ifeq_pattern = re.compile(r'^\s*ifeq\s*\(\s*\$\(CONFIG_([A-Z0-9_]+)\)\s*,\s*y\s*\)')
-    ifneq_pattern = re.compile(r'^\s*ifneq\s*\(\s*\$\(CONFIG_([A-Z0-9_]+)\)\s*,\s*y\s*\)')
-    else_pattern = re.compile(r'^\s*else\s*$')
-    endif_pattern = re.compile(r'^\s*endif\s*$')
+    cfiles = cfiles_by_path(paths, batch_size=batch_size)
+    config_ids = {}
+    for chunk in _chunked(config_names, batch_size):
+        config_ids.update(Config.objects.filter(name__in=chunk).values_list("name", "id"))
 
-    o_groups = {}
-    context_stack = []
+    KernelConfig.objects.bulk_create(
+        [
+            KernelConfig(kernel_version=kernel_version_obj, config_id=config_ids[config], cfile=cfiles[path])
+            for config, path in sorted(edges)
+        ],
+        batch_size=batch_size, ignore_conflicts=True
+    )
+    return cfiles
 
+
+def find_makefiles(root_dir: str) -> list:
+    """Kernel-relative paths of every Makefile / Kbuild file, sorted."""
+    makefiles = []
     for dirpath, _, filenames in os.walk(root_dir):
         for fname in filenames:
             if fname.lower() in ("makefile", "kbuild"):
-                filepath = os.path.join(dirpath, fname)
-                try:
+                makefiles.append(os.path.relpath(os.path.join(dirpath, fname), root_dir))
+    return sorted(makefiles)
+
+
+def read_makefiles(root_dir: str) -> dict:
+    """Kernel-relative path -> text for every Makefile / Kbuild file."""
+    makefiles = {}
+    for rel_path in find_makefiles(root_dir):
+        try:
+            with open(os.path.join(root_dir, rel_path), "r", encoding="utf-8", errors="ignore") as f:
+                makefiles[rel_path] = f.read()
+        except Exception as e:
+            print(f"Error reading {rel_path}: {e}")
+    return makefiles
+
+
+class KernelSourceTree:
+    """An extracted kernel tree on disk."""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def read_makefiles(self) -> dict:
+        return read_makefiles(self.root_dir)
+
+    def read_kconfigs(self) -> dict:
+        kconfigs = {}
+        for dirpath, _, filenames in os.walk(self.root_dir):
+            for fname in filenames:
+                if fname.startswith("Kconfig"):
+                    filepath = os.path.join(dirpath, fname)
                     with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                        lines = preprocess_lines(f.readlines())
-                except Exception as e:
-                    print(f"Error reading {filepath}: {e}")
-                    continue
-
-                for line in lines:
-                    # Context stack for ifdef / ifeq / ifneq
-                    if ifdef_match := ifdef_pattern.match(line):
-                        context_stack.append((ifdef_match.group(1), True))
-                        continue
-                    if ifeq_match := ifeq_pattern.match(line):
-                        context_stack.append((f"CONFIG_{ifeq_match.group(1)}", True))
-                        continue
-                    if ifneq_match := ifneq_pattern.match(line):
-                        context_stack.append((f"CONFIG_{ifneq_match.group(1)}", False))
-                        continue
-                    if else_pattern.match(line):
-                        if context_stack:
-                            var, val = context_stack.pop()
-                            context_stack.append((var, not val))
-                        continue
-                    if endif_pattern.match(line):
-                        if context_stack:
-                            context_stack.pop()
-                        continue
-
-                    # Handle foo-objs := a.o b.o
-                    if group_match := group_assign_pattern.match(line):
-                        group, members = group_match.groups()
-                        member_objs = members.strip().split()
-                        o_groups[group + ".o"] = [m for m in member_objs if m.endswith(".o")]
-                        continue
-
-                    # Handle obj-$(CONFIG_...) += foo.o
-                    if obj_match := obj_line_pattern.search(line):
-                        objs = obj_match.group(1).split()
-                        configs = config_ref_pattern.findall(line)
-
-                        # If no direct config but inside a context block
-                        if not configs and context_stack:
-                            configs = [cfg for cfg, active in context_stack if active]
-
-                        for obj in objs:
-                            if not obj.endswith(".o"):
-                                continue
-
-                            c_files = []
-                            if obj in o_groups:
-                                c_files = [o.replace(".o", ".c") for o in o_groups[obj]]
-                            else:
-                                c_files = [obj.replace(".o", ".c")]
-
-                            for cfile in c_files:
-                                cfile_path = os.path.normpath(os.path.join(dirpath, cfile))
-                                if not os.path.isfile(cfile_path):
-                                    continue
-
-                                cfile_name = os.path.basename(cfile_path)
-                                cfile_obj, _ = CFile.objects.get_or_create(name=cfile_name)
-
-                                for config in configs:
-                                    config_obj, _ = Config.objects.get_or_create(name=config)
-                                    KernelConfig.objects.get_or_create(
-                                        kernel_version=kernel_version_obj,
-                                        config=config_obj,
-                                        cfile=cfile_obj
-                                    )
+                        kconfigs[os.path.relpath(filepath, self.root_dir)] = f.read()
+        return kconfigs
+
+    def has_c_file(self, rel_path: str) -> bool:
+        return os.path.isfile(os.path.join(self.root_dir, rel_path))
+
+    def function_symbols(self, rel_path: str) -> set:
+        try:
+            with open(os.path.join(self.root_dir, rel_path), "r", encoding="utf-8", errors="ignore") as f:
+                return extract_function_symbols(f.read())
+        except Exception as e:
+            print(f"Error reading {rel_path}: {e}")
+            return set()
+
+
+def filter_existing(source, edges: set) -> set:
+    """Drop edges whose C file is not in the source tree (checked once per path)."""
+    paths = {path for _, path in edges}
+    existing = {path for path in paths if source.has_c_file(path)}
+    return {(config, path) for config, path in edges if path in existing}
+
+
+# Kconfig patterns
+kconfig_entry_pattern = re.compile(r'^\s*(?:menu)?config\s+([A-Za-z0-9_]+)\s*$')
+kconfig_depends_pattern = re.compile(r'^\s*depends\s+on\s+(.+)$')
+kconfig_block_pattern = re.compile(r'^\s*(menu|choice|if)\b\s*(.*)$')
+kconfig_end_pattern = re.compile(r'^\s*(endmenu|endchoice|endif)\b')
+kconfig_other_entry_pattern = re.compile(r'^\s*(comment|source|mainmenu)\b')
+kconfig_symbol_pattern = re.compile(r'^[A-Za-z0-9_]+$')
+
+
+def _split_top_level(expr: str, op: str) -> list:
+    """Split `expr` on `op` where it appears outside parentheses."""
+    parts = []
+    depth = 0
+    start = 0
+    i = 0
+    while i < len(expr):
+        char = expr[i]
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and expr.startswith(op, i):
+            parts.append(expr[start:i])
+            i += len(op)
+            start = i
+            continue
+        i += 1
+    parts.append(expr[start:])
+    return parts
+
+
+def _strip_outer_parens(expr: str) -> str:
+    """Remove parentheses that wrap the whole of `expr` (not just "(A) && (B)")."""
+    expr = expr.strip()
+    while expr.startswith("(") and expr.endswith(")"):
+        depth = 0
+        for i, char in enumerate(expr):
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0 and i < len(expr) - 1:
+                    return expr
+        expr = expr[1:-1].strip()
+    return expr
+
+
+def kconfig_conjuncts(expr: str) -> set:
+    """
+    CONFIG_* symbols that `expr` strictly requires: plain symbols joined by &&.
+    A top-level || makes no single symbol required, so it yields nothing;
+    terms using !, comparisons or constants are not hard requirements and are skipped.
+    """
+    expr = _strip_outer_parens(expr.split("#", 1)[0])
+    if len(_split_top_level(expr, "||")) > 1:
+        return set()
+    symbols = set()
+    for term in _split_top_level(expr, "&&"):
+        term = term.strip()
+        if term.startswith("("):
+            symbols.update(kconfig_conjuncts(term))
+        elif kconfig_symbol_pattern.match(term) and term not in ("y", "m", "n"):
+            symbols.add(f"CONFIG_{term}")
+    return symbols
+
+
+def parse_kconfig(text: str) -> dict:
+    """
+    Direct dependencies per symbol in one Kconfig file: CONFIG_X -> set of CONFIG_*
+    from its own `depends on` lines plus enclosing if / menu / choice blocks.
+    A symbol defined more than once is enabled by any of its definitions, so
+    only the dependencies common to all of them are kept.
+    """
+    definitions = defaultdict(list)
+    blocks = []  # dependency sets of the enclosing if / menu / choice blocks
+    current = None  # dependency set that a `depends on` line applies to
+    in_help = False
+
+    for raw_line in text.splitlines():
+        # help text runs until the next line that is not indented
+        if in_help:
+            if raw_line and not raw_line[0].isspace():
+                in_help = False
+            else:
+                continue
+        line = raw_line.strip()
+
+        if line in ("help", "---help---"):
+            in_help = True
+            continue
+        if entry_match := kconfig_entry_pattern.match(line):
+            symbol = f"CONFIG_{entry_match.group(1)}"
+            current = set()
+            definitions[symbol].append(current)
+            for block_deps in blocks:
+                current.update(block_deps)
+            continue
+        if block_match := kconfig_block_pattern.match(line):
+            kind, rest = block_match.groups()
+            block_deps = kconfig_conjuncts(rest) if kind == "if" else set()
+            blocks.append(block_deps)
+            current = block_deps if kind != "if" else None
+            continue
+        if kconfig_end_pattern.match(line):
+            if blocks:
+                blocks.pop()
+            current = None
+            continue
+        if kconfig_other_entry_pattern.match(line):
+            current = None
+            continue
+        if depends_match := kconfig_depends_pattern.match(line):
+            if current is not None:
+                current.update(kconfig_conjuncts(depends_match.group(1)))
+    return {symbol: set.intersection(*symbol_deps) for symbol, symbol_deps in definitions.items()}
+
+
+def merge_kconfig_deps(parsed_files) -> dict:
+    """Combine parse_kconfig() results of several files, intersecting symbols defined in more than one."""
+    merged = {}
+    for deps in parsed_files:
+        for symbol, symbol_deps in deps.items():
+            if symbol in merged:
+                merged[symbol] &= symbol_deps
+            else:
+                merged[symbol] = set(symbol_deps)
+    return merged
+
+
+def kconfig_closure(symbol: str, kconfig_deps: dict, memo: dict) -> frozenset:
+    """All symbols `symbol` transitively depends on (cycles are cut)."""
+    if symbol in memo:
+        return memo[symbol]
+    memo[symbol] = frozenset()  # cycle guard
+    closure = set()
+    for dep in kconfig_deps.get(symbol, ()):
+        closure.add(dep)
+        closure.update(kconfig_closure(dep, kconfig_deps, memo))
+    memo[symbol] = frozenset(closure)
+    return memo[symbol]
+
+
+def directory_requirements(dir_gates: set) -> dict:
+    """
+    Subdirectory -> the one CONFIG symbol that gates descending into it.
+    Directories reached unconditionally or through several different symbols
+    have no single requirement and are left out.
+    """
+    gates_by_dir = defaultdict(set)
+    for config, subdir in dir_gates:
+        gates_by_dir[subdir].add(config)
+    return {
+        subdir: next(iter(configs))
+        for subdir, configs in gates_by_dir.items()
+        if len(configs) == 1 and None not in configs
+    }
+
+
+def compute_edge_requirements(edges: set, dir_gates: set, kconfig_deps: dict) -> dict:
+    """
+    (config, path) -> sorted tuple of every other symbol needed to build `path`
+    through `config`: gates of all parent directories and the Kconfig
+    `depends on` closure of each of them.
+    """
+    dir_requirements = directory_requirements(dir_gates)
+    memo = {}
+    requirements = {}
+    for config, path in edges:
+        needed = {config}
+        parent = os.path.dirname(path)
+        while parent:
+            if parent in dir_requirements:
+                needed.add(dir_requirements[parent])
+            parent = os.path.dirname(parent)
+        for symbol in list(needed):
+            needed.update(kconfig_closure(symbol, kconfig_deps, memo))
+        needed.discard(config)
+        requirements[(config, path)] = tuple(sorted(needed))
+    return requirements
+
+
+def save_edge_requirements(kernel_version_obj, requirements: dict, batch_size: int = DEFAULT_BATCH_SIZE):
+    """Store each edge's extra requirements on its KernelConfig row, touching only rows that changed."""
+    changed = []
+    rows = (
+        KernelConfig.objects
+        .filter(kernel_version=kernel_version_obj)
+        .select_related("config", "cfile")
+        .only("pk", "requires", "config__name", "cfile__path")
+    )
+    for row in rows.iterator(chunk_size=10000):
+        needed = list(requirements.get((row.config.name, row.cfile.path), ()))
+        if row.requires != needed:
+            row.requires = needed
+            changed.append(row)
+    KernelConfig.objects.bulk_update(changed, ["requires"], batch_size=batch_size)
+    print(f"[🔗] Updated dependency requirements of {len(changed)} edges")
 
+
+def version_key(version: str) -> tuple:
+    return tuple(int(part) for part in re.findall(r'\d+', version)[:3])
+
+
+def find_base_version(version: str):
+    """
+    Closest already-ingested version of the same major.minor series
+    (e.g. 5.10.199 for 5.10.200), preferring older releases on ties.
+    """
+    key = version_key(version)
+    candidates = [
+        kv for kv in KernelVersion.objects.filter(parsed_makefiles__isnull=False).exclude(version=version).distinct()
+        if version_key(kv.version)[:2] == key[:2]
+    ]
+    if not candidates:
+        return None
+    patch = key[2] if len(key) > 2 else 0
+
+    def distance(kv):
+        other = version_key(kv.version)
+        other_patch = other[2] if len(other) > 2 else 0
+        return abs(other_patch - patch), other_patch > patch
+
+    return min(candidates, key=distance)
+
+
+def save_parsed_makefiles(kernel_version_obj, hashes: dict, per_file: dict, batch_size: int = DEFAULT_BATCH_SIZE):
+    """Remember each Makefile's content hash and parse result for later incremental runs."""
+    ParsedMakefile.objects.filter(kernel_version=kernel_version_obj).delete()
+    ParsedMakefile.objects.bulk_create(
+        [
+            ParsedMakefile(
+                kernel_version=kernel_version_obj,
+                path=path,
+                content_hash=hashes[path],
+                edges=sorted(per_file[path][0]),
+                dir_gates=sorted(per_file[path][1], key=lambda gate: (gate[0] or "", gate[1])),
+            )
+            for path in sorted(hashes)
+        ],
+        batch_size=batch_size
+    )
+
+
+def _version_edge_rows(kernel_version_obj) -> dict:
+    """(config, path) -> (pk, config_id, cfile_id) for one version's KernelConfig rows."""
+    rows = (
+        KernelConfig.objects
+        .filter(kernel_version=kernel_version_obj)
+        .values_list("config__name", "cfile__path", "pk", "config_id", "cfile_id")
+        .iterator(chunk_size=10000)
+    )
+    return {(config, path): (pk, config_id, cfile_id) for config, path, pk, config_id, cfile_id in rows}
+
+
+@transaction.atomic
+def apply_edge_delta(kernel_version_obj, base_version_obj, edges: set, batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    Bring the KernelConfig rows of `kernel_version_obj` in line with `edges`,
+    deleting and inserting only the difference. A version with no rows yet
+    starts from the rows of `base_version_obj`, copied by id.
+    """
+    current = _version_edge_rows(kernel_version_obj)
+    if not current and base_version_obj is not None:
+        base_rows = {edge: row for edge, row in _version_edge_rows(base_version_obj).items() if edge in edges}
+        KernelConfig.objects.bulk_create(
+            [
+                KernelConfig(kernel_version=kernel_version_obj, config_id=config_id, cfile_id=cfile_id)
+                for _, config_id, cfile_id in base_rows.values()
+            ],
+            batch_size=batch_size, ignore_conflicts=True
+        )
+        print(f"[♻️] Copied {len(base_rows)} unchanged edges from {base_version_obj.version}")
+        current = base_rows
+
+    removed = [pk for edge, (pk, _, _) in current.items() if edge not in edges]
+    for chunk in _chunked(removed, batch_size):
+        KernelConfig.objects.filter(pk__in=chunk).delete()
+    added = edges - current.keys()
+    save_kernel_edges(kernel_version_obj, added, batch_size=batch_size)
+    print(f"[Δ] KernelConfig delta for {kernel_version_obj.version}: +{len(added)} / -{len(removed)}")
+
+
+def parse_makefiles_and_save(version: str, batch_size: int = DEFAULT_BATCH_SIZE, workers: int = None,
+                             incremental: bool = True, streaming: bool = False):
+    """
+    Ingest one kernel version. With streaming=True the release tarball is read once
+    without extracting it (see stream_kernel_tarball) instead of using a source tree on disk.
+    """
+    if streaming:
+        _ingest_kernel_source(version, stream_kernel_tarball(version), batch_size, workers, incremental)
+    else:
+        with download_and_extract_kernel(version) as tree:
+            _ingest_kernel_source(version, KernelSourceTree(tree), batch_size, workers, incremental)
+
+
+def _ingest_kernel_source(version: str, source, batch_size: int, workers: int, incremental: bool):
+    kernel_version_obj, _ = KernelVersion.objects.get_or_create(version=version)
+
+    makefiles = source.read_makefiles()
+    hashes = {path: makefile_hash(text) for path, text in makefiles.items()}
+
+    # Reuse the parse of every Makefile that is byte-identical in the closest ingested version
+    base_version_obj = find_base_version(version) if incremental else None
+    reused = {}
+    if base_version_obj is not None:
+        previous = (
+            ParsedMakefile.objects
+            .filter(kernel_version=base_version_obj)
+            .values_list("path", "content_hash", "edges", "dir_gates")
+        )
+        for path, content_hash, file_edges, file_gates in previous:
+            if hashes.get(path) == content_hash:
+                reused[path] = ({tuple(edge) for edge in file_edges}, {tuple(gate) for gate in file_gates})
+        print(f"[♻️] Base {base_version_obj.version}: reusing {len(reused)} Makefiles, "
+              f"parsing {len(makefiles) - len(reused)} changed/added")
+
+    parsed = parse_makefile_texts({p: t for p, t in makefiles.items() if p not in reused}, workers=workers)
+    per_file = {**reused, **parsed}
+    save_parsed_makefiles(kernel_version_obj, hashes, per_file, batch_size=batch_size)
+
+    edges = filter_existing(source, set().union(*(file_edges for file_edges, _ in per_file.values())))
+    dir_gates = set().union(*(file_gates for _, file_gates in per_file.values()))
+    print(f"[🧮] Collected {len(edges)} config → C file edges, writing ...")
+    apply_edge_delta(kernel_version_obj, base_version_obj, edges, batch_size=batch_size)
+
+    kconfig_deps = merge_kconfig_deps(parse_kconfig(text) for text in source.read_kconfigs().values())
+    requirements = compute_edge_requirements(edges, dir_gates, kconfig_deps)
+    save_edge_requirements(kernel_version_obj, requirements, batch_size=batch_size)
+
+    built_cfiles = cfiles_by_path({path for _, path in edges}, batch_size=batch_size)
+    index_function_symbols(source, kernel_version_obj, built_cfiles, batch_size=batch_size)
+
+    # Any exported or in-process index of this version, and every result computed from it, is stale now
+    KernelVersion.objects.filter(pk=kernel_version_obj.pk).update(index_revision=F("index_revision") + 1)
+    remove_kernel_index_snapshot(version)
+    clear_kernel_config_index(kernel_version_obj)
     print(f"[✅] Kernel parsing complete for version {version}")
 
 
 import tarfile
 import urllib.request
 
-def download_and_extract_kernel(version: str) -> str:
-    short_version = ".".join(version.split(".")[:2])
+def kernel_tarball_url(version: str) -> str:
     major_digit = version.split(".")[0]
     major_series = f"v{major_digit}.x"
-    url = f"https://cdn.kernel.org/pub/linux/kernel/{major_series}/linux-{version}.tar.xz"
-    dest_dir = os.path.join(KERNEL_CACHE_DIR, version)
-    archive_path = os.path.join(KERNEL_CACHE_DIR, f"linux-{version}.tar.xz")
+    return f"https://cdn.kernel.org/pub/linux/kernel/{major_series}/linux-{version}.tar.xz"
+
 
-    if os.path.exists(dest_dir):
-        print(f"[✓] Kernel source already extracted at {dest_dir}")
-        return dest_dir
+def _fetch_kernel_tarball(version: str, staging_dir: str) -> str:
+    url = kernel_tarball_url(version)
+    archive_path = os.path.join(staging_dir, f"linux-{version}.tar.xz")
 
     print(f"[↓] Downloading kernel source: {url}")
     urllib.request.urlretrieve(url, archive_path)
 
-    print(f"[📦] Extracting kernel source to {dest_dir}")
+    print(f"[📦] Extracting kernel source for {version}")
     with tarfile.open(archive_path, "r:xz") as tar:
-        tar.extractall(path=KERNEL_CACHE_DIR)
+        tar.extractall(path=staging_dir)
+    os.remove(archive_path)
+    return os.path.join(staging_dir, f"linux-{version}")
+
+
+def download_and_extract_kernel(version: str, use_git: bool = False):
+    """
+    Context manager yielding the extracted source tree of `version`, served from the
+    shared, size-capped kernel cache; the tree stays pinned until the block exits.
+    """
+    fetch = _fetch_kernel_git if use_git else _fetch_kernel_tarball
+    return kernel_source_cache.get_tree(version, fetch)
+
+
+class StreamedKernelSource:
+    """
+    Build metadata of a kernel release read from its tarball in one pass:
+    Makefile / Kbuild / Kconfig texts, a manifest of every .c path and,
+    optionally, the functions each .c file defines. Nothing is written to disk.
+    """
+
+    def __init__(self):
+        self.makefiles = {}
+        self.kconfigs = {}
+        self.c_files = set()
+        self.symbols = {}
 
-    os.rename(os.path.join(KERNEL_CACHE_DIR, f"linux-{version}"), dest_dir)
-    return dest_dir
+    def read_makefiles(self) -> dict:
+        return self.makefiles
+
+    def read_kconfigs(self) -> dict:
+        return self.kconfigs
+
+    def has_c_file(self, rel_path: str) -> bool:
+        return rel_path in self.c_files
+
+    def function_symbols(self, rel_path: str) -> set:
+        return self.symbols.get(rel_path, set())
+
+
+def _read_member_text(tar, member) -> str:
+    return tar.extractfile(member).read().decode("utf-8", errors="ignore")
+
+
+def stream_kernel_tarball(version: str, index_symbols: bool = True) -> StreamedKernelSource:
+    """
+    Read the kernel tarball for `version` as a stream (local copy in KERNEL_CACHE_DIR
+    if present, otherwise straight from kernel.org) and keep only build metadata.
+    C sources are scanned for function definitions on the fly and then dropped.
+    """
+    archive_path = os.path.join(KERNEL_CACHE_DIR, f"linux-{version}.tar.xz")
+    if os.path.exists(archive_path):
+        fileobj = open(archive_path, "rb")
+    else:
+        url = kernel_tarball_url(version)
+        print(f"[↓] Streaming kernel source: {url}")
+        fileobj = urllib.request.urlopen(url)
+
+    source = StreamedKernelSource()
+    with fileobj, tarfile.open(fileobj=fileobj, mode="r|xz") as tar:
+        for member in tar:
+            if not member.isfile() or "/" not in member.name:
+                continue
+            rel_path = member.name.split("/", 1)[1]  # strip the linux-x.y.z/ prefix
+            fname = os.path.basename(rel_path)
+            if fname.lower() in ("makefile", "kbuild"):
+                source.makefiles[rel_path] = _read_member_text(tar, member)
+            elif fname.startswith("Kconfig"):
+                source.kconfigs[rel_path] = _read_member_text(tar, member)
+            elif fname.endswith(".c"):
+                source.c_files.add(rel_path)
+                if index_symbols:
+                    source.symbols[rel_path] = extract_function_symbols(_read_member_text(tar, member))
 
+    print(f"[📦] Streamed {len(source.makefiles)} Makefiles, {len(source.kconfigs)} Kconfig files, "
+          f"{len(source.c_files)} C files for {version}")
+    return source
@@ -1,8 +1,155 @@
+# kernel_analysis/dot_config.py
+import functools
+import hashlib
+import json
+import os
+import re
+import stat
+import sys
+
+# Per-user by default: cache files are trusted input, so the directory must not be writable by others
+DOT_CONFIG_CACHE_DIR = os.environ.get("DOT_CONFIG_CACHE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "kernel-analysis", "dot-config"
+)
+# Bump whenever the cached JSON layout changes
+DOT_CONFIG_CACHE_FORMAT = 2
+
+TRISTATE_VALUES = ("y", "m", "n")
+
+set_pattern = re.compile(r'^(CONFIG_[A-Za-z0-9_]+)=(.*)$')
+not_set_pattern = re.compile(r'^#\s*(CONFIG_[A-Za-z0-9_]+) is not set')
+
+# content hash -> DotConfig, and (path, mtime, size) -> content hash
+_CONFIG_CACHE = {}
+_HASH_CACHE = {}
+
+
+class DotConfig:
+    """
+    A parsed kernel .config.
+
+    `values` keeps every symbol the file mentions: 'y', 'm', 'n' (from
+    "# CONFIG_X is not set") or the raw value of string/int options.
+    Symbols that do not appear are unset. `enabled` (=y) and `built`
+    (=y or =m) are frozensets of interned names for fast membership tests.
+    """
+
+    def __init__(self, content_hash: str, values: dict):
+        self.content_hash = content_hash
+        self.values = {sys.intern(k): v for k, v in values.items()}
+        self.enabled = frozenset(k for k, v in self.values.items() if v == "y")
+        self.built = frozenset(k for k, v in self.values.items() if v in ("y", "m"))
+
+    def tristate(self, symbol: str):
+        """Return 'y', 'm' or 'n', or None if the symbol is unset (or not a tristate)."""
+        value = self.values.get(symbol)
+        return value if value in TRISTATE_VALUES else None
+
+    def __contains__(self, symbol):
+        return symbol in self.enabled
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getstate__(self):
+        return {"content_hash": self.content_hash, "values": self.values}
+
+    def __setstate__(self, state):
+        self.__init__(state["content_hash"], state["values"])
+
+
+def parse_dot_config_text(content_hash: str, text: str) -> DotConfig:
+    values = {}
+    for line in text.splitlines():
+        if match := set_pattern.match(line):
+            values[match.group(1)] = match.group(2).strip().strip('"')
+        elif match := not_set_pattern.match(line):
+            values[match.group(1)] = "n"
+    return DotConfig(content_hash, values)
+
+
+@functools.lru_cache(maxsize=None)
+def _cache_dir():
+    """
+    The on-disk cache directory, created with mode 0700, or None if it is not a
+    directory owned by the current user and closed to everyone else.
+    Checked once per process.
+    """
+    try:
+        os.makedirs(DOT_CONFIG_CACHE_DIR, mode=0o700, exist_ok=True)
+        st = os.lstat(DOT_CONFIG_CACHE_DIR)
+    except OSError as e:
+        print(f"[⚠️] .config cache disabled: {e}")
+        return None
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        print(f"[⚠️] .config cache disabled: {DOT_CONFIG_CACHE_DIR} must be a directory owned by you with mode 0700")
+        return None
+    return DOT_CONFIG_CACHE_DIR
+
+
+def _cache_path(cache_dir: str, content_hash: str) -> str:
+    return os.path.join(cache_dir, f"{content_hash}.v{DOT_CONFIG_CACHE_FORMAT}.json")
+
+
+def _read_cached(content_hash: str):
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+    try:
+        with open(_cache_path(cache_dir, content_hash)) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("content_hash") != content_hash or not isinstance(cached.get("values"), dict):
+        return None
+    return DotConfig(content_hash, cached["values"])
+
+
+def _write_cached(config: DotConfig):
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return
+    path = _cache_path(cache_dir, config.content_hash)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump({"content_hash": config.content_hash, "values": config.values}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[⚠️] Could not cache parsed config {config.content_hash[:12]}: {e}")
+
+
+def load_dot_config(filepath: str) -> DotConfig:
+    """
+    Return the parsed .config for `filepath`, cached by content hash.
+    Lookups within a process cost one stat() once the file has been seen;
+    other processes and later runs reuse the cached JSON parse from disk.
+    """
+    st = os.stat(filepath)
+    stat_key = (os.path.abspath(filepath), st.st_mtime_ns, st.st_size)
+    content_hash = _HASH_CACHE.get(stat_key)
+    data = None
+    if content_hash is None:
+        with open(filepath, "rb") as f:
+            data = f.read()
+        content_hash = hashlib.sha256(data).hexdigest()
+        _HASH_CACHE[stat_key] = content_hash
+
+    config = _CONFIG_CACHE.get(content_hash)
+    if config is not None:
+        return config
+
+    config = _read_cached(content_hash)
+    if config is None:
+        if data is None:
+            with open(filepath, "rb") as f:
+                data = f.read()
+        config = parse_dot_config_text(content_hash, data.decode("utf-8", errors="ignore"))
+        _write_cached(config)
+    _CONFIG_CACHE[content_hash] = config
+    return config
+
+
 def parse_dot_config(filepath):
-    configs = set()
-    with open(filepath, "r") as f:
-        for line in f:
-            if line.startswith("CONFIG_") and "=y" in line:
-                key = line.split("=")[0].strip()
-                configs.add(key)
-    return configs
+    """Set of CONFIG_* symbols built in (=y)."""
+    return load_dot_config(filepath).enabled
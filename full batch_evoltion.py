@@ -1,18 +1,325 @@
-from your_app.models import KernelVersion, CVEState
-from kernel_analysis.cve_analysis import evaluate_cve_applicability
+import multiprocessing
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-def evaluate_all_cves(kernel_version_str: str, config_path: str):
+import django
+from django.db import connections, transaction
+from your_app.models import KernelVersion, CVEState, ConfigVariant, CVEVariantResult
+from kernel_analysis.nlp_extractor import extract_candidates_from_description
+from kernel_analysis.cve_analysis import (
+    evaluate_cve_applicability, resolve_candidate_paths, cve_fingerprint, refresh_cve_candidates, load_cve_candidates
+)
+from kernel_analysis.kernel_index import get_kernel_config_index
+from kernel_analysis.dot_config import load_dot_config
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_WRITE_BATCH_SIZE = 5000
+RESULT_FIELDS = ["applicable", "reason", "status", "fingerprint"]
+# Everything an evaluator reads, plus the result fields read back afterwards (an evaluator
+# may leave some of them untouched), so no deferred-field query is issued per CVE
+EVALUATION_FIELDS = ["pk", "cve_id", "description", *RESULT_FIELDS]
+
+
+def _init_worker():
+    # Forked workers inherit the parent's Django setup (setup() is then a no-op) but must
+    # not share its DB connections
+    django.setup()
+    connections.close_all()
+
+
+def _evaluation_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for evaluation chunks. The workers are always forked: this module imports
+    the models at top level, so a spawn / forkserver child (the Linux default from Python
+    3.14) would fail with AppRegistryNotReady before _init_worker runs. Forking also lets
+    workers inherit the index and parsed .config loaded before the pool starts.
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               mp_context=multiprocessing.get_context("fork"))
+
+
+def _chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def evaluate_cve_chunk(kernel_version_id: int, config_path: str, cve_ids: list):
+    """
+    Evaluate a chunk of CVEs without writing anything back.
+    Returns (results, failures) where results are (pk, cve_id, applicable, reason, status,
+    fingerprint) tuples and failures are (cve_id, error) tuples.
+    """
+    kernel_version = KernelVersion.objects.get(pk=kernel_version_id)
+    index = get_kernel_config_index(kernel_version)
+    candidates = load_cve_candidates(cve_ids)
+    results, failures = [], []
+
+    for cve in CVEState.objects.filter(pk__in=cve_ids).only(*EVALUATION_FIELDS):
+        try:
+            evaluate_cve_applicability(cve, kernel_version, config_path, index=index, save=False,
+                                       candidates=candidates.get(cve.pk))
+            results.append((cve.pk, cve.cve_id, cve.applicable, cve.reason, cve.status, cve.fingerprint))
+        except Exception as e:
+            failures.append((cve.cve_id, str(e)))
+    return results, failures
+
+
+def _write_results(pending: list, write_batch_size: int):
+    with transaction.atomic():
+        CVEState.objects.bulk_update(pending, RESULT_FIELDS, batch_size=write_batch_size)
+
+
+def stale_cve_ids(kernel_version, dot_config) -> list:
+    """Primary keys of the CVEs whose stored fingerprint no longer matches their inputs."""
+    rows = CVEState.objects.order_by("pk").values_list("pk", "description", "fingerprint").iterator(chunk_size=10000)
+    return [
+        pk for pk, description, fingerprint in rows
+        if fingerprint != cve_fingerprint(description, kernel_version, dot_config)
+    ]
+
+
+def evaluate_all_cves(kernel_version_str: str, config_path: str, workers: int = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE, force: bool = False):
+    """
+    Evaluate CVEs against one kernel version and .config. Only CVEs whose
+    fingerprint changed since their last evaluation are re-evaluated unless
+    `force` is set.
+    """
     try:
         kernel_version = KernelVersion.objects.get(version=kernel_version_str)
     except KernelVersion.DoesNotExist:
         print(f"[❌] Kernel version {kernel_version_str} not found in DB.")
         return
 
-    all_cves = CVEState.objects.all()
+    # Loaded before the pool starts so forked workers inherit them instead of re-querying / re-parsing
+    get_kernel_config_index(kernel_version)
+    dot_config = load_dot_config(config_path)
+    refresh_cve_candidates()
+    if force:
+        cve_ids = list(CVEState.objects.order_by("pk").values_list("pk", flat=True))
+    else:
+        cve_ids = stale_cve_ids(kernel_version, dot_config)
+        unchanged = CVEState.objects.count() - len(cve_ids)
+        print(f"[⏭️] {unchanged} CVEs unchanged since their last evaluation")
+    chunks = list(_chunked(cve_ids, chunk_size))
+    workers = workers or os.cpu_count() or 1
+
+    pending = []
+    evaluated = failed = 0
+
+    def collect(results, failures):
+        nonlocal pending, evaluated, failed
+        for pk, cve_id, applicable, reason, status, fingerprint in results:
+            pending.append(CVEState(pk=pk, applicable=applicable, reason=reason, status=status,
+                                    fingerprint=fingerprint))
+            print(f"[✔] {cve_id} → {'Applicable' if applicable else 'Not applicable'}")
+        for cve_id, error in failures:
+            print(f"[⚠️] Failed to evaluate {cve_id}: {error}")
+        evaluated += len(results)
+        failed += len(failures)
+        if len(pending) >= write_batch_size:
+            _write_results(pending, write_batch_size)
+            pending = []
+
+    print(f"[⚙️] Evaluating {len(cve_ids)} CVEs in {len(chunks)} chunks with {workers} worker(s)")
+    if workers == 1:
+        for chunk in chunks:
+            collect(*evaluate_cve_chunk(kernel_version.pk, config_path, chunk))
+    else:
+        connections.close_all()
+        with _evaluation_pool(workers) as pool:
+            futures = {
+                pool.submit(evaluate_cve_chunk, kernel_version.pk, config_path, chunk): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                try:
+                    collect(*future.result())
+                except Exception as e:
+                    chunk = futures[future]
+                    failed += len(chunk)
+                    print(f"[⚠️] Failed to evaluate chunk of {len(chunk)} CVEs (pk {chunk[0]}–{chunk[-1]}): {e}")
+
+    if pending:
+        _write_results(pending, write_batch_size)
+    print(f"[📊] {evaluated} evaluated, {failed} failed")
+
+
+def _set_bits(mask: int):
+    """Positions of the set bits of `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
 
-    for cve in all_cves:
+def _variant_reasons(index, candidates: list, satisfied, all_variants: int) -> dict:
+    """
+    variant number -> reason for every variant a CVE applies to. Candidates and
+    edges are visited in the same order as evaluate_cve_applicability, and each
+    variant keeps the first edge that satisfies it.
+    """
+    reasons = {}
+    remaining = all_variants
+    for item in candidates:
+        for cfile_path in resolve_candidate_paths(index, item):
+            for config_name, mask in index.requirements_for_path(cfile_path):
+                hit = satisfied(mask) & remaining
+                if not hit:
+                    continue
+                for variant in _set_bits(hit):
+                    reasons[variant] = f"{config_name} enabled for {cfile_path} (match: {item})"
+                remaining &= ~hit
+                if not remaining:
+                    return reasons
+    return reasons
+
+
+def _write_variant_results(pending: list, write_batch_size: int):
+    with transaction.atomic():
+        CVEVariantResult.objects.bulk_create(
+            pending, batch_size=write_batch_size,
+            update_conflicts=True, unique_fields=["cve", "variant"], update_fields=["applicable", "reason"]
+        )
+
+
+class _VariantMatcher:
+    """
+    Which of several .config variants satisfy a requirement mask. Each CONFIG
+    symbol gets a bitset over the variants that enable it, so the variants
+    satisfying an edge are the AND of the bitsets of the symbols it requires.
+    """
+
+    def __init__(self, index, dot_configs: list):
+        self.all_variants = (1 << len(dot_configs)) - 1
+        # symbol bit -> bitset of the variants that build that symbol in
+        self.variant_bits = defaultdict(int)
+        for number, dot_config in enumerate(dot_configs):
+            for symbol in dot_config.enabled:
+                bit = index.symbol_ids.get(symbol)
+                if bit is not None:
+                    self.variant_bits[bit] |= 1 << number
+        self._cache = {}  # requirement mask -> variants satisfying it
+
+    def __call__(self, mask: int) -> int:
+        hit = self._cache.get(mask)
+        if hit is None:
+            hit = self.all_variants
+            for bit in _set_bits(mask):
+                hit &= self.variant_bits.get(bit, 0)
+                if not hit:
+                    break
+            self._cache[mask] = hit
+        return hit
+
+
+_MATCHERS = {}  # (kernel version pk, config paths) -> _VariantMatcher, per process
+
+
+def evaluate_cve_matrix_chunk(kernel_version_id: int, config_paths: tuple, cve_ids: list):
+    """
+    Evaluate a chunk of CVEs against every variant without writing anything back.
+    Returns (results, failures) where results are (pk, cve_id, reasons) tuples,
+    `reasons` mapping variant number -> reason for each variant the CVE applies to,
+    and failures are (cve_id, error) tuples.
+    """
+    kernel_version = KernelVersion.objects.get(pk=kernel_version_id)
+    index = get_kernel_config_index(kernel_version)
+    key = (kernel_version_id, tuple(config_paths))
+    matcher = _MATCHERS.get(key)
+    if matcher is None:
+        matcher = _MATCHERS[key] = _VariantMatcher(index, [load_dot_config(path) for path in config_paths])
+
+    cached_candidates = load_cve_candidates(cve_ids)
+    results, failures = [], []
+    for cve in CVEState.objects.filter(pk__in=cve_ids).order_by("pk").only("pk", "cve_id", "description"):
         try:
-            evaluate_cve_applicability(cve, kernel_version, config_path)
-            print(f"[✔] {cve.cve_id} → {'Applicable' if cve.applicable else 'Not applicable'}")
+            candidates = cached_candidates.get(cve.pk)
+            if candidates is None:
+                candidates = extract_candidates_from_description(cve.description)
+            results.append((cve.pk, cve.cve_id, _variant_reasons(index, candidates, matcher, matcher.all_variants)))
         except Exception as e:
-            print(f"[⚠️] Failed to evaluate {cve.cve_id}: {e}")
+            failures.append((cve.cve_id, str(e)))
+    return results, failures
+
+
+def evaluate_cve_matrix(kernel_version_str: str, config_paths: list, workers: int = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE):
+    """
+    Evaluate every CVE against several .config variants in one pass.
+
+    Candidates and their C file edges are resolved once per CVE, not once per
+    variant (see _VariantMatcher). Chunks of CVEs are spread over a process
+    pool as in evaluate_all_cves. Results are stored per variant in CVEVariantResult.
+    """
+    try:
+        kernel_version = KernelVersion.objects.get(version=kernel_version_str)
+    except KernelVersion.DoesNotExist:
+        print(f"[❌] Kernel version {kernel_version_str} not found in DB.")
+        return
+
+    config_paths = tuple(config_paths)
+    # Loaded before the pool starts so forked workers inherit them instead of re-querying / re-parsing
+    get_kernel_config_index(kernel_version)
+    dot_configs = [load_dot_config(path) for path in config_paths]
+    refresh_cve_candidates()
+    variants = [
+        ConfigVariant.objects.update_or_create(name=path, defaults={"config_hash": dot_config.content_hash})[0]
+        for path, dot_config in zip(config_paths, dot_configs)
+    ]
+    cve_ids = list(CVEState.objects.order_by("pk").values_list("pk", flat=True))
+    chunks = list(_chunked(cve_ids, chunk_size))
+    workers = workers or os.cpu_count() or 1
+
+    pending = []
+    evaluated = failed = 0
+    applicable_counts = [0] * len(variants)
+
+    def collect(results, failures):
+        nonlocal pending, evaluated, failed
+        for pk, cve_id, reasons in results:
+            for number, variant in enumerate(variants):
+                reason = reasons.get(number)
+                if reason is not None:
+                    applicable_counts[number] += 1
+                pending.append(CVEVariantResult(
+                    cve_id=pk, variant=variant,
+                    applicable=reason is not None, reason=reason or "No matching config enabled."
+                ))
+            print(f"[✔] {cve_id} → applicable in {len(reasons)}/{len(variants)} variants")
+        for cve_id, error in failures:
+            print(f"[⚠️] Failed to evaluate {cve_id}: {error}")
+        evaluated += len(results)
+        failed += len(failures)
+        if len(pending) >= write_batch_size:
+            _write_variant_results(pending, write_batch_size)
+            pending = []
+
+    print(f"[⚙️] Evaluating {len(cve_ids)} CVEs against {len(variants)} config variants "
+          f"in {len(chunks)} chunks with {workers} worker(s)")
+    if workers == 1:
+        for chunk in chunks:
+            collect(*evaluate_cve_matrix_chunk(kernel_version.pk, config_paths, chunk))
+    else:
+        connections.close_all()
+        with _evaluation_pool(workers) as pool:
+            futures = {
+                pool.submit(evaluate_cve_matrix_chunk, kernel_version.pk, config_paths, chunk): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                try:
+                    collect(*future.result())
+                except Exception as e:
+                    chunk = futures[future]
+                    failed += len(chunk)
+                    print(f"[⚠️] Failed to evaluate chunk of {len(chunk)} CVEs (pk {chunk[0]}–{chunk[-1]}): {e}")
+
+    if pending:
+        _write_variant_results(pending, write_batch_size)
+    for variant, count in zip(variants, applicable_counts):
+        print(f"[📊] {variant.name}: {count} applicable")
+    print(f"[📊] {evaluated} evaluated, {failed} failed")
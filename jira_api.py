@@ -116,32 +116,182 @@ if __name__ == "__main__":
 
 import requests
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 0.5  # seconds, doubled per retry unless the server sends Retry-After
+DEFAULT_TIMEOUT = 30
+DEFAULT_CONCURRENCY = 8
+RETRY_STATUSES = (429, 503)
+BULK_CREATE_LIMIT = 50  # issues per POST /issue/bulk, the API maximum
+SEARCH_KEYS_PER_QUERY = 100  # keys per "key in (...)" JQL clause
+SEARCH_PAGE_SIZE = 100
+DEFAULT_ISSUE_FIELDS = ('summary', 'status', 'updated')
+DEFAULT_CACHE_ENTRIES = 1024
+DEFAULT_CACHE_MAX_AGE = 300  # seconds a cached issue is trusted before its `updated` is checked again
+
+
+def adf_document(text):
+    """
+    Wrap plain text in an Atlassian Document Format document, which REST API v3
+    requires for rich-text fields such as `description`. Each line becomes a
+    paragraph; blank lines are dropped because ADF rejects empty text nodes.
+    """
+    return {
+        'type': 'doc',
+        'version': 1,
+        'content': [
+            {'type': 'paragraph', 'content': [{'type': 'text', 'text': line}]}
+            for line in text.splitlines() if line.strip()
+        ]
+    }
+
+class IssueCache:
+    """
+    Read-through cache for get_issue: an in-process LRU in front of an optional
+    on-disk store with one JSON file per issue key. Each entry is trusted for
+    `max_age` seconds after it was fetched or last checked against the issue's
+    `updated` timestamp (see JiraAPI.validate_cached_issues).
+    """
+    def __init__(self, cache_dir=None, max_entries=DEFAULT_CACHE_ENTRIES, max_age=DEFAULT_CACHE_MAX_AGE):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict()  # issue key -> issue JSON, least recently used first
+        self._checked = {}  # issue key -> monotonic time of the last fetch or check
+        self._lock = threading.Lock()  # JiraBulkAPI calls in from worker threads
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def updated(issue):
+        return issue.get('fields', {}).get('updated')
+
+    def _path(self, issue_key):
+        return os.path.join(self.cache_dir, issue_key.replace(os.sep, '_') + '.json')
+
+    def _remember(self, issue_key, issue):
+        self._entries[issue_key] = issue
+        self._entries.move_to_end(issue_key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._checked.pop(evicted, None)
+
+    def get(self, issue_key):
+        """Cached issue JSON, from memory or disk, or None."""
+        with self._lock:
+            issue = self._entries.get(issue_key)
+            if issue is not None:
+                self._entries.move_to_end(issue_key)
+                return issue
+            if not self.cache_dir:
+                return None
+            try:
+                with open(self._path(issue_key)) as f:
+                    issue = json.load(f)
+            except (OSError, ValueError):
+                return None
+            self._remember(issue_key, issue)
+            return issue
+
+    def put(self, issue_key, issue):
+        with self._lock:
+            self._remember(issue_key, issue)
+            self._checked[issue_key] = time.monotonic()
+            if self.cache_dir:
+                path = self._path(issue_key)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(issue, f)
+                os.replace(tmp_path, path)
+
+    def is_fresh(self, issue_key):
+        checked = self._checked.get(issue_key)
+        return checked is not None and time.monotonic() - checked < self.max_age
+
+    def mark_checked(self, issue_key):
+        self._checked[issue_key] = time.monotonic()
+
+    def invalidate(self, issue_key):
+        with self._lock:
+            self._entries.pop(issue_key, None)
+            self._checked.pop(issue_key, None)
+            if self.cache_dir:
+                try:
+                    os.remove(self._path(issue_key))
+                except FileNotFoundError:
+                    pass
 
 class JiraAPI:
-    def __init__(self, base_url, email, api_token):
-        self.base_url = base_url
+    def __init__(self, base_url, email, api_token, pool_size=DEFAULT_POOL_SIZE,
+                 max_retries=DEFAULT_MAX_RETRIES, timeout=DEFAULT_TIMEOUT, cache=None):
+        """
+        :param base_url: JIRA instance URL, e.g. https://your-domain.atlassian.net or a local stub server.
+        :param pool_size: Keep-alive connections kept open; should be at least the bulk concurrency.
+        :param max_retries: Retries on HTTP 429/503 and connection failures, honouring Retry-After.
+        :param cache: Optional IssueCache that get_issue reads through.
+        """
+        self.base_url = base_url.rstrip('/')
         self.auth = (email, api_token)
         self.headers = {
             'Content-Type': 'application/json',
             'Accept': 'application/json'
         }
         self.api_endpoint = '/rest/api/3/issue'
+        self.timeout = timeout
+        self.cache = cache
+        self.session = self._make_session(pool_size, max_retries)
+
+    def _make_session(self, pool_size, max_retries):
+        # 429/503 mean the request was rejected before being processed, so retrying is safe for every method.
+        # A read timeout or dropped response may come after the server acted on it, so those are never retried.
+        retry = Retry(
+            total=max_retries,
+            read=0,
+            other=0,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=None,
+            backoff_factor=DEFAULT_BACKOFF,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.auth = self.auth
+        session.headers.update(self.headers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def close(self):
+        self.session.close()
+
+    @staticmethod
+    def _issue_fields(project_key, summary, description, issue_type):
+        return {
+            'project': {
+                'key': project_key
+            },
+            'summary': summary,
+            'description': adf_document(description) if isinstance(description, str) else description,
+            'issuetype': {
+                'name': issue_type
+            }
+        }
 
     def create_issue(self, project_key, summary, description, issue_type):
         url = self.base_url + self.api_endpoint
         payload = {
-            'fields': {
-                'project': {
-                    'key': project_key
-                },
-                'summary': summary,
-                'description': description,
-                'issuetype': {
-                    'name': issue_type
-                }
-            }
+            'fields': self._issue_fields(project_key, summary, description, issue_type)
         }
-        response = requests.post(url, headers=self.headers, auth=self.auth, data=json.dumps(payload))
+        response = self.session.post(url, data=json.dumps(payload), timeout=self.timeout)
         if response.status_code == 201:
             issue = response.json()
             return issue['key'], issue['id']
@@ -149,11 +299,112 @@ class JiraAPI:
             print(f"Failed to create issue: {response.status_code} {response.text}")
             return None
 
+    def create_issues(self, issues):
+        """
+        Create up to BULK_CREATE_LIMIT issues with one POST /issue/bulk request.
+        :param issues: List of dictionaries containing project_key, summary, description, and issue_type.
+        :return: (created, errors): created maps a position in `issues` to (key, id), errors maps it to a message.
+        """
+        url = self.base_url + self.api_endpoint + '/bulk'
+        payload = {
+            'issueUpdates': [
+                {'fields': self._issue_fields(issue.get('project_key'), issue.get('summary'),
+                                              issue.get('description'), issue.get('issue_type'))}
+                for issue in issues
+            ]
+        }
+        response = self.session.post(url, data=json.dumps(payload), timeout=self.timeout)
+        if response.status_code not in (201, 400):
+            error = f"{response.status_code} {response.text}"
+            return {}, {position: error for position in range(len(issues))}
+
+        body = response.json()
+        errors = {}
+        for error in body.get('errors', []):
+            details = error.get('elementErrors', {})
+            messages = details.get('errorMessages', []) + [
+                f"{field}: {message}" for field, message in details.get('errors', {}).items()
+            ]
+            errors[error['failedElementNumber']] = '; '.join(messages) or str(error.get('status'))
+        # Created issues are listed in request order, skipping the failed elements
+        succeeded = [position for position in range(len(issues)) if position not in errors]
+        created = {position: (issue['key'], issue['id']) for position, issue in zip(succeeded, body.get('issues', []))}
+        for position in succeeded:
+            if position not in created:
+                errors[position] = '; '.join(body.get('errorMessages', [])) or f"{response.status_code} {response.text}"
+        return created, errors
+
+    def search_issues(self, jql, fields=DEFAULT_ISSUE_FIELDS, page_size=SEARCH_PAGE_SIZE):
+        """
+        Yield every issue matching a JQL query, following pagination.
+        :param fields: Only these fields are returned for each issue.
+        :raises requests.HTTPError: If a page cannot be fetched, so a failed search is never mistaken for no matches.
+        """
+        url = self.base_url + '/rest/api/3/search/jql'
+        payload = {
+            'jql': jql,
+            'fields': list(fields),
+            'maxResults': page_size
+        }
+        while True:
+            response = self.session.post(url, data=json.dumps(payload), timeout=self.timeout)
+            if response.status_code != 200:
+                raise requests.HTTPError(f"Failed to search issues: {response.status_code} {response.text}",
+                                         response=response)
+            body = response.json()
+            yield from body.get('issues', [])
+            next_page = body.get('nextPageToken')
+            if body.get('isLast', True) or not next_page:
+                return
+            payload['nextPageToken'] = next_page
+
+    def validate_cached_issues(self, issue_keys):
+        """
+        Check cached issues that are due for it against JIRA with one JQL query per
+        SEARCH_KEYS_PER_QUERY keys that only returns `updated`. Entries whose issue
+        changed or disappeared are dropped; if a search fails its entries are kept
+        but stay unchecked, so get_issue fetches those issues directly until a
+        later check succeeds. Call this once with every key a job is about
+        to read (JiraBulkAPI.bulk_get_cached_issues does) so that the following
+        get_issue calls are served locally.
+        """
+        if self.cache is None:
+            return
+        due = {}
+        for issue_key in issue_keys:
+            if not self.cache.is_fresh(issue_key):
+                issue = self.cache.get(issue_key)
+                if issue is not None:
+                    due[issue_key] = IssueCache.updated(issue)
+        keys = list(due)
+        for start in range(0, len(keys), SEARCH_KEYS_PER_QUERY):
+            chunk = keys[start:start + SEARCH_KEYS_PER_QUERY]
+            jql = 'key in (' + ', '.join(f'"{key}"' for key in chunk) + ')'
+            try:
+                current = {issue['key']: IssueCache.updated(issue) for issue in self.search_issues(jql, ('updated',))}
+            except requests.RequestException as e:
+                print(f"Could not validate {len(chunk)} cached issues: {e}")
+                continue
+            for issue_key in chunk:
+                if issue_key in current and current[issue_key] == due[issue_key]:
+                    self.cache.mark_checked(issue_key)
+                else:
+                    self.cache.invalidate(issue_key)
+
     def get_issue(self, issue_key):
+        if self.cache is not None:
+            self.validate_cached_issues([issue_key])
+            # Only serve entries that were fetched or checked within max_age
+            issue = self.cache.get(issue_key) if self.cache.is_fresh(issue_key) else None
+            if issue is not None:
+                return issue
         url = self.base_url + self.api_endpoint + '/' + issue_key
-        response = requests.get(url, headers=self.headers, auth=self.auth)
+        response = self.session.get(url, timeout=self.timeout)
         if response.status_code == 200:
-            return response.json()
+            issue = response.json()
+            if self.cache is not None:
+                self.cache.put(issue_key, issue)
+            return issue
         else:
             print(f"Failed to get issue: {response.status_code} {response.text}")
             return None
@@ -163,56 +414,96 @@ class JiraAPI:
         payload = {
             'fields': fields
         }
-        response = requests.put(url, headers=self.headers, auth=self.auth, data=json.dumps(payload))
+        response = self.session.put(url, data=json.dumps(payload), timeout=self.timeout)
+        if self.cache is not None:
+            self.cache.invalidate(issue_key)
         if response.status_code == 204:
             print(f"Issue {issue_key} updated successfully.")
+            return True
         else:
             print(f"Failed to update issue: {response.status_code} {response.text}")
+            return False
 
 class JiraBulkAPI:
-    def __init__(self, jira_api):
+    def __init__(self, jira_api, concurrency=DEFAULT_CONCURRENCY):
+        """
+        :param jira_api: JiraAPI whose pooled session is shared by all worker threads.
+        :param concurrency: Maximum number of requests in flight at once.
+        """
         self.jira_api = jira_api
+        self.concurrency = concurrency
+
+    def _run(self, func, items):
+        """Call func on every item with at most `concurrency` requests in flight; results keep input order."""
+        def call(item):
+            try:
+                return func(item)
+            except requests.RequestException as e:
+                print(f"Request failed: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            return list(pool.map(call, items))
 
-    def bulk_create_issues(self, issues):
+    def bulk_create_issues(self, issues, return_errors=False):
         """
-        Create multiple issues in JIRA.
+        Create multiple issues in JIRA, BULK_CREATE_LIMIT per request.
         :param issues: List of dictionaries containing project_key, summary, description, and issue_type.
-        :return: List of created issue keys and IDs.
-        """
-        created_issues = []
-        for issue in issues:
-            project_key = issue.get('project_key')
-            summary = issue.get('summary')
-            description = issue.get('description')
-            issue_type = issue.get('issue_type')
-            result = self.jira_api.create_issue(project_key, summary, description, issue_type)
-            if result:
-                created_issues.append(result)
-        return created_issues
-
-    def bulk_get_issues(self, issue_keys):
-        """
-        Get details of multiple issues in JIRA.
+        :param return_errors: Also return a dict mapping the position of every failed issue to its error.
+        :return: List of created issue keys and IDs, in input order.
+        """
+        starts = range(0, len(issues), BULK_CREATE_LIMIT)
+        results = self._run(lambda start: self.jira_api.create_issues(issues[start:start + BULK_CREATE_LIMIT]), starts)
+
+        created_issues, errors = [], {}
+        for start, result in zip(starts, results):
+            chunk_size = len(issues[start:start + BULK_CREATE_LIMIT])
+            created, chunk_errors = result or ({}, {position: "request failed" for position in range(chunk_size)})
+            for position in range(chunk_size):
+                if position in created:
+                    created_issues.append(created[position])
+                else:
+                    errors[start + position] = chunk_errors.get(position, "not created")
+        for position, error in sorted(errors.items()):
+            print(f"Failed to create issue {position} ({issues[position].get('summary')}): {error}")
+        return (created_issues, errors) if return_errors else created_issues
+
+    def bulk_get_issues(self, issue_keys, fields=DEFAULT_ISSUE_FIELDS):
+        """
+        Get details of multiple issues in JIRA with paginated "key in (...)" searches.
         :param issue_keys: List of issue keys to fetch.
-        :return: List of issue details.
+        :param fields: Issue fields to fetch; keep this to what the caller reads.
+        :return: List of issue details, in input order; unknown keys are skipped.
         """
-        issues = []
-        for issue_key in issue_keys:
-            issue = self.jira_api.get_issue(issue_key)
-            if issue:
-                issues.append(issue)
-        return issues
+        def search(start):
+            keys = issue_keys[start:start + SEARCH_KEYS_PER_QUERY]
+            jql = 'key in (' + ', '.join(f'"{key}"' for key in keys) + ')'
+            return list(self.jira_api.search_issues(jql, fields))
+
+        found = {}
+        for issues in self._run(search, range(0, len(issue_keys), SEARCH_KEYS_PER_QUERY)):
+            for issue in issues or []:
+                found[issue['key']] = issue
+        return [found[key] for key in issue_keys if key in found]
+
+    def bulk_get_cached_issues(self, issue_keys):
+        """
+        Get full issue JSON through the JiraAPI's IssueCache: every cached key is
+        validated with one batched check up front, so only changed or uncached
+        issues are downloaded.
+        :param issue_keys: List of issue keys to fetch.
+        :return: List of issue details, in input order; issues that could not be fetched are skipped.
+        """
+        self.jira_api.validate_cached_issues(issue_keys)
+        return [issue for issue in self._run(self.jira_api.get_issue, issue_keys) if issue is not None]
 
     def bulk_update_issues(self, updates):
         """
         Update multiple issues in JIRA.
         :param updates: List of dictionaries containing issue_key and fields to update.
-        :return: None
+        :return: List of booleans telling which updates succeeded, in input order.
         """
-        for update in updates:
-            issue_key = update.get('issue_key')
-            fields = update.get('fields')
-            self.jira_api.update_issue(issue_key, fields)
+        return self._run(lambda update: self.jira_api.update_issue(update.get('issue_key'), update.get('fields')), updates)
 
 # Example usage
 if __name__ == "__main__":
@@ -220,7 +511,7 @@ if __name__ == "__main__":
     email = 'your-email@example.com'
     api_token = 'your-api-token'
 
-    jira = JiraAPI(jira_url, email, api_token)
+    jira = JiraAPI(jira_url, email, api_token, cache=IssueCache('.jira-cache'))
     jira_bulk = JiraBulkAPI(jira)
 
     # Bulk create issues
@@ -233,7 +524,7 @@ if __name__ == "__main__":
 
     # Bulk get issues
     issue_keys_to_get = [issue[0] for issue in created_issues]  # Extract issue keys from created issues
-    fetched_issues = jira_bulk.bulk_get_issues(issue_keys_to_get)
+    fetched_issues = jira_bulk.bulk_get_cached_issues(issue_keys_to_get)
     print(f"Issue details: {json.dumps(fetched_issues, indent=2)}")
 
     # Bulk update issues
@@ -0,0 +1,117 @@
+# kernel_analysis/jira_sync.py
+import os
+from django.db import transaction
+from django.utils import timezone
+from your_app.models import CVEState, JiraSyncState
+from kernel_analysis.jira_api import IssueCache, JiraAPI, JiraBulkAPI
+
+# CVEState attribute -> Jira field id it is mirrored into
+DEFAULT_FIELD_MAP = {
+    "applicable": os.environ.get("JIRA_APPLICABLE_FIELD", "customfield_10100"),
+    "reason": os.environ.get("JIRA_REASON_FIELD", "customfield_10101"),
+}
+DEFAULT_SYNC_BATCH_SIZE = 500
+DEFAULT_ISSUE_TYPE = "Bug"
+
+
+def jira_field_values(applicable: bool, reason: str, field_map: dict) -> dict:
+    """Jira field id -> value for one CVE result."""
+    values = {"applicable": "Applicable" if applicable else "Not applicable", "reason": reason}
+    return {field_map[attr]: value for attr, value in values.items() if attr in field_map}
+
+
+def changed_fields(desired: dict, pushed: dict) -> dict:
+    return {field: value for field, value in desired.items() if pushed.get(field) != value}
+
+
+def _push_batch(jira_bulk, batch: list):
+    """Send one batch of (state pk, issue key, changed fields, new pushed state); returns successful updates."""
+    results = jira_bulk.bulk_update_issues([{"issue_key": key, "fields": fields} for _, key, fields, _ in batch])
+    now = timezone.now()
+    synced = [
+        JiraSyncState(pk=pk, pushed_fields=pushed, pushed_at=now)
+        for (pk, _, _, pushed), ok in zip(batch, results) if ok
+    ]
+    with transaction.atomic():
+        JiraSyncState.objects.bulk_update(synced, ["pushed_fields", "pushed_at"], batch_size=DEFAULT_SYNC_BATCH_SIZE)
+    return len(synced)
+
+
+def sync_cve_results(jira_bulk, field_map: dict = None, batch_size: int = DEFAULT_SYNC_BATCH_SIZE):
+    """
+    Mirror evaluated CVE results into their linked Jira issues. The desired field
+    values are compared with what was last pushed, and only issues with changed
+    fields are updated, sending just those fields. The pushed state is recorded
+    only for updates Jira accepted, so failures are retried on the next sync.
+    """
+    field_map = field_map or DEFAULT_FIELD_MAP
+    rows = (
+        JiraSyncState.objects
+        .filter(cve__status="done")
+        .order_by("pk")
+        .values_list("pk", "issue_key", "pushed_fields", "cve__applicable", "cve__reason")
+        .iterator(chunk_size=5000)
+    )
+
+    batch = []
+    checked = pushed = failed = 0
+    for pk, issue_key, pushed_fields, applicable, reason in rows:
+        checked += 1
+        desired = jira_field_values(applicable, reason, field_map)
+        delta = changed_fields(desired, pushed_fields)
+        if not delta:
+            continue
+        batch.append((pk, issue_key, delta, {**pushed_fields, **desired}))
+        if len(batch) >= batch_size:
+            synced = _push_batch(jira_bulk, batch)
+            pushed += synced
+            failed += len(batch) - synced
+            batch = []
+    if batch:
+        synced = _push_batch(jira_bulk, batch)
+        pushed += synced
+        failed += len(batch) - synced
+
+    print(f"[🔁] Jira sync: {checked} linked CVEs checked, {pushed} issues updated, {failed} failed")
+    return pushed
+
+
+def create_cve_issues(jira_bulk, project_key: str, issue_type: str = DEFAULT_ISSUE_TYPE,
+                      batch_size: int = DEFAULT_SYNC_BATCH_SIZE):
+    """
+    Create a Jira issue for every evaluated CVE that is not linked to one yet and
+    record the link as a JiraSyncState row, so sync_cve_results picks it up.
+    CVEs whose issue could not be created stay unlinked and are retried next time.
+    """
+    unlinked = list(
+        CVEState.objects
+        .filter(status="done", jira_sync__isnull=True)
+        .order_by("pk")
+        .values_list("pk", "cve_id", "description")
+    )
+    linked = 0
+    for start in range(0, len(unlinked), batch_size):
+        batch = unlinked[start:start + batch_size]
+        issues = [
+            {"project_key": project_key, "summary": cve_id, "description": description, "issue_type": issue_type}
+            for _, cve_id, description in batch
+        ]
+        created, errors = jira_bulk.bulk_create_issues(issues, return_errors=True)
+        # Created issues come back in input order, skipping the failed positions
+        succeeded = [pk for position, (pk, _, _) in enumerate(batch) if position not in errors]
+        with transaction.atomic():
+            JiraSyncState.objects.bulk_create(
+                [JiraSyncState(cve_id=pk, issue_key=key) for pk, (key, _) in zip(succeeded, created)],
+                batch_size=batch_size
+            )
+        linked += len(created)
+
+    print(f"[🔗] Jira link: {linked} issues created for {len(unlinked)} unlinked CVEs")
+    return linked
+
+
+def jira_bulk_from_env(concurrency: int = None) -> JiraBulkAPI:
+    """JiraBulkAPI from JIRA_URL / JIRA_EMAIL / JIRA_API_TOKEN, with an on-disk issue cache if JIRA_CACHE_DIR is set."""
+    cache = IssueCache(os.environ["JIRA_CACHE_DIR"]) if os.environ.get("JIRA_CACHE_DIR") else None
+    jira = JiraAPI(os.environ["JIRA_URL"], os.environ["JIRA_EMAIL"], os.environ["JIRA_API_TOKEN"], cache=cache)
+    return JiraBulkAPI(jira, concurrency) if concurrency else JiraBulkAPI(jira)
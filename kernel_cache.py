@@ -0,0 +1,215 @@
+# kernel_analysis/kernel_cache.py
+import fcntl
+import hashlib
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+KERNEL_CACHE_MAX_BYTES = int(os.environ.get("KERNEL_CACHE_MAX_BYTES", str(20 * 1024 ** 3)))
+COMPLETE_MARKER = ".complete"
+STORE_SIZE_FILE = "store-size"
+
+
+@contextmanager
+def file_lock(path: str):
+    """Exclusive advisory lock on `path`, shared by all processes on the host."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@contextmanager
+def try_file_lock(path: str):
+    """Exclusive advisory lock on `path` if it is free right now; yields whether it was taken."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class KernelSourceCache:
+    """
+    Extracted kernel trees under one directory, kept within a byte budget.
+
+    Every file is stored once in a content-addressed object store
+    (objects/ab/cdef...) and hardlinked into trees/<version>/, so stable
+    releases that share most of their files cost little extra space.
+    Trees are evicted least-recently-used first. Readers hold a shared
+    lock on the version's lock file while they use a tree; fetching takes
+    it exclusively, and eviction skips any tree it cannot lock exclusively.
+    The store size is kept in a state file so it is not re-walked on every use.
+    Trees share inodes, so they must be treated as read-only.
+    """
+
+    def __init__(self, root: str, max_bytes: int = KERNEL_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(root, "objects")
+        self.trees_dir = os.path.join(root, "trees")
+        self.locks_dir = os.path.join(root, "locks")
+        self.tmp_dir = os.path.join(root, "tmp")
+        self.size_path = os.path.join(root, STORE_SIZE_FILE)
+
+    def tree_path(self, version: str) -> str:
+        return os.path.join(self.trees_dir, version)
+
+    def has_tree(self, version: str) -> bool:
+        return os.path.exists(os.path.join(self.tree_path(version), COMPLETE_MARKER))
+
+    def _version_lock_path(self, version: str) -> str:
+        return os.path.join(self.locks_dir, f"{version}.lock")
+
+    @contextmanager
+    def get_tree(self, version: str, fetch):
+        """
+        Context manager yielding the path of the extracted tree for `version`,
+        fetching it on a miss. The tree cannot be evicted until the block exits.
+        `fetch(version, staging_dir)` must populate a directory below
+        `staging_dir` and return the path of the tree root.
+        """
+        tree = self.tree_path(version)
+        lock_path = self._version_lock_path(version)
+        os.makedirs(self.locks_dir, exist_ok=True)
+        imported = False
+        with open(lock_path, "a") as lock_file:
+            try:
+                # flock up/downgrades are not atomic, so re-check the tree after every switch
+                while True:
+                    fcntl.flock(lock_file, fcntl.LOCK_SH)
+                    if self.has_tree(version):
+                        break
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    if not self.has_tree(version):
+                        self._fetch_tree(version, fetch, tree)
+                        imported = True
+                if not imported:
+                    print(f"[✓] Kernel source {version} found in cache")
+                os.utime(os.path.join(tree, COMPLETE_MARKER))  # last-used time for LRU
+                if imported:
+                    self.evict(keep={version})
+                yield tree
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _fetch_tree(self, version: str, fetch, tree: str):
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix=f"{version}-", dir=self.tmp_dir)
+        try:
+            source_root = fetch(version, staging_dir)
+            with file_lock(os.path.join(self.locks_dir, "store.lock")):
+                size = self._read_store_size()
+                self._write_store_size(size + self._import_tree(source_root, tree))
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def _import_tree(self, source_root: str, tree: str) -> int:
+        """
+        Move every file of `source_root` into the object store and hardlink it into `tree`.
+        Returns the bytes of newly stored objects.
+        """
+        if os.path.exists(tree):
+            shutil.rmtree(tree)  # leftovers of an interrupted import
+        stored = linked = added = 0
+        for dirpath, _, filenames in os.walk(source_root):
+            target_dir = os.path.normpath(os.path.join(tree, os.path.relpath(dirpath, source_root)))
+            os.makedirs(target_dir, exist_ok=True)
+            for fname in filenames:
+                src = os.path.join(dirpath, fname)
+                dst = os.path.join(target_dir, fname)
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), dst)
+                    continue
+                obj = self._object_path(file_digest(src))
+                if not os.path.exists(obj):
+                    os.makedirs(os.path.dirname(obj), exist_ok=True)
+                    os.replace(src, obj)
+                    os.chmod(obj, 0o444)
+                    stored += 1
+                    added += os.lstat(obj).st_size
+                os.link(obj, dst)
+                linked += 1
+        open(os.path.join(tree, COMPLETE_MARKER), "w").close()
+        print(f"[🗃️] Cached {os.path.basename(tree)}: {linked} files, {stored} new objects")
+        return added
+
+    def store_bytes(self) -> int:
+        total = 0
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            for fname in filenames:
+                total += os.lstat(os.path.join(dirpath, fname)).st_size
+        return total
+
+    def _read_store_size(self) -> int:
+        """Bytes in the object store per the state file, walking the store once if it is missing."""
+        try:
+            with open(self.size_path) as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            size = self.store_bytes()
+            self._write_store_size(size)
+            return size
+
+    def _write_store_size(self, size: int):
+        tmp_path = f"{self.size_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(size))
+        os.replace(tmp_path, self.size_path)
+
+    def _collect_garbage(self) -> int:
+        """Delete objects no tree links to any more; returns bytes freed."""
+        freed = 0
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            for fname in filenames:
+                obj = os.path.join(dirpath, fname)
+                st = os.lstat(obj)
+                if st.st_nlink == 1:
+                    os.remove(obj)
+                    freed += st.st_size
+        return freed
+
+    def evict(self, keep=()):
+        """
+        Drop least-recently-used trees until the object store fits in the budget.
+        Trees that are in use (their version lock cannot be taken) are skipped.
+        """
+        with file_lock(os.path.join(self.locks_dir, "store.lock")):
+            used = self._read_store_size()
+            if used <= self.max_bytes:
+                return
+            trees = []
+            for version in os.listdir(self.trees_dir):
+                marker = os.path.join(self.tree_path(version), COMPLETE_MARKER)
+                if version not in keep and os.path.exists(marker):
+                    trees.append((os.path.getmtime(marker), version))
+            for _, version in sorted(trees):
+                if used <= self.max_bytes:
+                    break
+                with try_file_lock(self._version_lock_path(version)) as locked:
+                    if not locked:
+                        print(f"[⏭️] Kernel tree {version} is in use, not evicting it")
+                        continue
+                    os.remove(os.path.join(self.tree_path(version), COMPLETE_MARKER))
+                    shutil.rmtree(self.tree_path(version))
+                used -= self._collect_garbage()
+                self._write_store_size(used)
+                print(f"[🧹] Evicted kernel tree {version} (cache now {used / 1024 ** 3:.1f} GiB)")
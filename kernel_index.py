@@ -0,0 +1,162 @@
+# kernel_analysis/kernel_index.py
+import sys
+from bisect import bisect_left
+from collections import defaultdict
+from your_app.models import KernelConfig, FunctionSymbol
+from kernel_analysis.kernel_snapshot import load_kernel_index_snapshot
+
+# kernel_version pk -> KernelConfigIndex, so each version is loaded once per process
+_INDEX_CACHE = {}
+
+
+class KernelConfigIndex:
+    """
+    In-memory view of the KernelConfig table for one kernel version.
+    Maps every C file path to the set of CONFIG symbols that build it,
+    so CVE evaluation can resolve candidates without touching the DB.
+    Paths are kept sorted so directory wildcards become a range lookup,
+    and basenames and function names map straight to their paths.
+
+    Every edge also carries a requirement bitset over an interned symbol
+    table: its own CONFIG symbol, the gates of its parent directories and
+    their Kconfig dependencies. Checking an edge against a .config is one AND.
+    """
+
+    def __init__(self, version: str, index_revision: int = 0):
+        self.version = version
+        self.index_revision = index_revision  # KernelVersion.index_revision the data was read at
+        self.configs_by_path = defaultdict(set)
+        self.paths_by_name = defaultdict(set)
+        self.paths_by_symbol = defaultdict(set)
+        self.requirements_by_path = defaultdict(list)  # path -> [(config, requirement mask)]
+        self.symbol_ids = {}  # CONFIG_* -> bit position
+        self.sorted_paths = []
+        self._enabled_masks = {}  # .config content hash -> enabled mask
+
+    def symbol_bit(self, symbol: str) -> int:
+        bit = self.symbol_ids.get(symbol)
+        if bit is None:
+            bit = self.symbol_ids[sys.intern(symbol)] = len(self.symbol_ids)
+        return 1 << bit
+
+    def add(self, cfile_path: str, cfile_name: str, config_name: str, requires=()):
+        self.configs_by_path[cfile_path].add(config_name)
+        self.paths_by_name[cfile_name].add(cfile_path)
+        mask = self.symbol_bit(config_name)
+        for symbol in requires:
+            mask |= self.symbol_bit(symbol)
+        self.requirements_by_path[cfile_path].append((config_name, mask))
+
+    def add_symbol(self, symbol: str, cfile_path: str):
+        self.paths_by_symbol[symbol].add(cfile_path)
+
+    def finalize(self):
+        self.sorted_paths = sorted(self.configs_by_path)
+        for requirements in self.requirements_by_path.values():
+            requirements.sort()
+        return self
+
+    def enabled_mask(self, dot_config) -> int:
+        """Bitset of the symbols a DotConfig builds in, over this index's symbol table."""
+        mask = self._enabled_masks.get(dot_config.content_hash)
+        if mask is None:
+            mask = 0
+            for symbol in dot_config.enabled:
+                bit = self.symbol_ids.get(symbol)
+                if bit is not None:
+                    mask |= 1 << bit
+            self._enabled_masks[dot_config.content_hash] = mask
+        return mask
+
+    def requirements_for_path(self, path: str):
+        """(config, requirement mask) pairs through which `path` is built, sorted by config."""
+        return self.requirements_by_path.get(path, ())
+
+    def enabled_config_for_path(self, path: str, enabled_mask: int):
+        """First CONFIG symbol (by name) through which `path` is fully enabled, else None."""
+        for config_name, mask in self.requirements_by_path.get(path, ()):
+            if mask & enabled_mask == mask:
+                return config_name
+        return None
+
+    def configs_for_path(self, path: str):
+        return self.configs_by_path.get(path, set())
+
+    def has_path(self, path: str) -> bool:
+        return path in self.configs_by_path
+
+    def paths_for_name(self, name: str):
+        return sorted(self.paths_by_name.get(name, ()))
+
+    def paths_for_symbol(self, symbol: str):
+        return sorted(self.paths_by_symbol.get(symbol, ()))
+
+    def paths_with_prefix(self, prefix: str):
+        start = bisect_left(self.sorted_paths, prefix)
+        end = bisect_left(self.sorted_paths, prefix + "\uffff", lo=start)
+        return self.sorted_paths[start:end]
+
+    def __len__(self):
+        return len(self.configs_by_path)
+
+
+def resolve_c_file(index, mention: str):
+    """Paths for a .c mention: exact path from the kernel root if known, else by basename."""
+    if "/" in mention and index.has_path(mention.lstrip("./")):
+        return [mention.lstrip("./")]
+    return index.paths_for_name(mention.split("/")[-1])
+
+
+def resolve_wildcard(index, pattern: str):
+    """
+    Paths for a directory wildcard such as net/netfilter/*.c or net/ipv4/tcp_*.c.
+    Everything under the prefix matches, including subdirectories.
+    """
+    prefix, _, suffix = pattern.partition("*")
+    return [path for path in index.paths_with_prefix(prefix) if path.endswith(suffix)]
+
+
+def build_kernel_config_index(kernel_version_obj) -> KernelConfigIndex:
+    index = KernelConfigIndex(kernel_version_obj.version, kernel_version_obj.index_revision)
+    rows = (
+        KernelConfig.objects
+        .filter(kernel_version=kernel_version_obj)
+        .values_list("cfile__path", "cfile__name", "config__name", "requires")
+        .iterator(chunk_size=10000)
+    )
+    for cfile_path, cfile_name, config_name, requires in rows:
+        index.add(cfile_path, cfile_name, config_name, requires)
+    symbols = (
+        FunctionSymbol.objects
+        .filter(kernel_version=kernel_version_obj)
+        .values_list("name", "cfile__path")
+        .iterator(chunk_size=10000)
+    )
+    for symbol, cfile_path in symbols:
+        index.add_symbol(symbol, cfile_path)
+    return index.finalize()
+
+
+def get_kernel_config_index(kernel_version_obj):
+    """
+    Index for one kernel version: the exported snapshot file if there is one
+    (see export_kernel_index), otherwise built from the DB. Cached per process.
+    """
+    index = _INDEX_CACHE.get(kernel_version_obj.pk)
+    if index is None:
+        index = load_kernel_index_snapshot(kernel_version_obj.version, kernel_version_obj.index_revision)
+        if index is not None:
+            print(f"[📚] Using config index snapshot {index.path} for kernel {kernel_version_obj.version}")
+        else:
+            index = build_kernel_config_index(kernel_version_obj)
+            print(f"[📚] Loaded config index for kernel {kernel_version_obj.version} ({len(index)} C files)")
+        _INDEX_CACHE[kernel_version_obj.pk] = index
+    return index
+
+
+def clear_kernel_config_index(kernel_version_obj=None):
+    """Drop cached indexes, e.g. after re-ingesting a kernel version."""
+    if kernel_version_obj is None:
+        _INDEX_CACHE.clear()
+    else:
+        _INDEX_CACHE.pop(kernel_version_obj.pk, None)
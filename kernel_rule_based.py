@@ -90,59 +90,196 @@ SUBSYSTEM_HINTS = {
 }
 
 
+# Bump whenever extraction rules change, so persisted candidates are recomputed
+EXTRACTOR_VERSION = 1
+
 FUNC_PATTERN = re.compile(r'\b([a-zA-Z_][a-zA-Z0-9_]+)\s*\(')
+C_FILE_PATTERN = re.compile(r'\b([\w/.-]+\.c)\b')
 
-def extract_candidates_from_description(description: str) -> list:
-    candidates = set()
+
+def build_keyword_matcher(hints: dict):
+    """
+    Compile all hint keywords into one word-bounded alternation (longest first),
+    so a description is scanned once instead of once per keyword.
+    Also returns, per keyword, the keywords it contains as whole words
+    ("usb audio" -> "usb audio", "usb") since a single regex pass
+    only reports the longest match at each position.
+    """
+    keywords = sorted(hints, key=len, reverse=True)
+    pattern = re.compile(r'\b(?:' + '|'.join(re.escape(k) for k in keywords) + r')\b')
+    implied = {
+        keyword: [other for other in keywords if re.search(rf'\b{re.escape(other)}\b', keyword)]
+        for keyword in keywords
+    }
+    return pattern, implied
+
+
+KEYWORD_PATTERN, KEYWORD_IMPLIES = build_keyword_matcher(SUBSYSTEM_HINTS)
+
+
+def match_subsystem_keywords(description: str) -> set:
+    matched = set()
+    for match in KEYWORD_PATTERN.finditer(description.lower()):
+        matched.update(KEYWORD_IMPLIES[match.group(0)])
+    return matched
+
+
+def extract_candidate_groups(description: str) -> dict:
+    """
+    Candidates of one description by kind: "c_files" (file mentions), "wildcards"
+    (directory patterns from subsystem hints), "functions" and the matched "keywords".
+    Every list is sorted, so the result can be stored and compared as-is.
+    """
+    c_files, wildcards = set(), set()
 
     # 1. Direct .c file mentions
-    c_files = re.findall(r'\b([\w/.-]+\.c)\b', description)
-    candidates.update(c_files)
+    c_files.update(C_FILE_PATTERN.findall(description))
 
-    # 2. Subsystem keyword matching
-    for keyword, folders in SUBSYSTEM_HINTS.items():
-        if keyword in description.lower():
-            for folder in folders:
-                candidates.add(f"{folder}*.c")
+    # 2. Subsystem keyword matching (single pass, whole words only)
+    keywords = match_subsystem_keywords(description)
+    for keyword in keywords:
+        for hint in SUBSYSTEM_HINTS[keyword]:
+            # hints are either directories or already a file / file pattern
+            candidate = hint if hint.endswith(".c") else f"{hint}*.c"
+            (wildcards if "*" in candidate else c_files).add(candidate)
 
     # 3. Function name matches
-    funcs = FUNC_PATTERN.findall(description)
-    for func in funcs:
-        candidates.add(func.strip())
+    functions = {func.strip() for func in FUNC_PATTERN.findall(description)}
+
+    return {
+        "c_files": sorted(c_files),
+        "wildcards": sorted(wildcards),
+        "functions": sorted(functions),
+        "keywords": sorted(keywords),
+    }
+
+
+def candidates_from_groups(groups: dict) -> list:
+    """Flat candidate list (files, then wildcards, then functions) from extract_candidate_groups output."""
+    candidates = []
+    for kind in ("c_files", "wildcards", "functions"):
+        candidates.extend(item for item in groups[kind] if item not in candidates)
+    return candidates
+
+
+def extract_candidates_from_description(description: str) -> list:
+    return candidates_from_groups(extract_candidate_groups(description))
+
+
+def extract_candidates_batch(descriptions: list) -> list:
+    """Candidates for many descriptions at once, in input order."""
+    return [extract_candidates_from_description(description or "") for description in descriptions]
 
-    return list(candidates)
+import hashlib
+from django.db import transaction
+from your_app.models import CVEState, CVECandidates
+from kernel_analysis.nlp_extractor import (
+    EXTRACTOR_VERSION, candidates_from_groups, extract_candidate_groups, extract_candidates_from_description
+)
+from kernel_analysis.kernel_index import get_kernel_config_index, resolve_c_file, resolve_wildcard
+from kernel_analysis.dot_config import load_dot_config
 
-from kernel_analysis.nlp_extractor import extract_candidates_from_description
+# Bump whenever matching rules change, so every stored result is recomputed
+# (extraction changes are covered by EXTRACTOR_VERSION, which is part of the fingerprint too)
+RULESET_VERSION = 1
 
-def evaluate_cve_applicability(cve_obj, kernel_version_obj, config_file_path: str):
-    candidates = extract_candidates_from_description(cve_obj.description)
-    user_configs = parse_dot_config(config_file_path)
+
+CANDIDATE_BATCH_SIZE = 2000
+CANDIDATE_FIELDS = ["description_hash", "extractor_version", "c_files", "wildcards", "functions", "keywords"]
+
+
+def description_hash(description: str) -> str:
+    return hashlib.sha256((description or "").encode("utf-8")).hexdigest()
+
+
+def cve_fingerprint(description: str, kernel_version_obj, dot_config) -> str:
+    """
+    Hash of everything a CVE's result depends on: its description, the kernel
+    version and index revision, the .config content and the extractor and
+    rule-set versions.
+    """
+    inputs = (
+        description_hash(description), kernel_version_obj.version, str(kernel_version_obj.index_revision),
+        dot_config.content_hash, str(EXTRACTOR_VERSION), str(RULESET_VERSION),
+    )
+    return hashlib.sha256("\0".join(inputs).encode("utf-8")).hexdigest()
+
+
+def refresh_cve_candidates(batch_size: int = CANDIDATE_BATCH_SIZE) -> int:
+    """
+    Extract and store candidates for every CVE whose description or the
+    extractor changed since they were last stored. Returns how many were refreshed.
+    """
+    stored = dict(
+        CVECandidates.objects
+        .filter(extractor_version=EXTRACTOR_VERSION)
+        .values_list("cve_id", "description_hash")
+    )
+    stale = []
+    for pk, description in CVEState.objects.order_by("pk").values_list("pk", "description").iterator(chunk_size=10000):
+        digest = description_hash(description)
+        if stored.get(pk) != digest:
+            stale.append((pk, digest, description or ""))
+
+    for i in range(0, len(stale), batch_size):
+        rows = [
+            CVECandidates(cve_id=pk, description_hash=digest, extractor_version=EXTRACTOR_VERSION,
+                          **extract_candidate_groups(description))
+            for pk, digest, description in stale[i:i + batch_size]
+        ]
+        with transaction.atomic():
+            CVECandidates.objects.bulk_create(
+                rows, update_conflicts=True, unique_fields=["cve"], update_fields=CANDIDATE_FIELDS
+            )
+    print(f"[🔎] Extracted candidates for {len(stale)} CVEs ({len(stored)} cached)")
+    return len(stale)
+
+
+def load_cve_candidates(cve_ids) -> dict:
+    """
+    CVE pk -> flat candidate list from the persisted cache. CVEs without a
+    current entry (description edited, extractor bumped) are left out.
+    """
+    rows = (
+        CVECandidates.objects
+        .filter(cve_id__in=cve_ids, extractor_version=EXTRACTOR_VERSION)
+        .values_list("cve_id", "cve__description", "description_hash", "c_files", "wildcards", "functions")
+    )
+    return {
+        pk: candidates_from_groups({"c_files": c_files, "wildcards": wildcards, "functions": functions})
+        for pk, description, digest, c_files, wildcards, functions in rows
+        if digest == description_hash(description)
+    }
+
+
+def resolve_candidate_paths(index, item: str):
+    """Kernel-relative C file paths a description candidate points at."""
+    if "*" in item:
+        # directory wildcard -> every file under that path
+        return resolve_wildcard(index, item)
+    if item.endswith(".c"):
+        return resolve_c_file(index, item)
+    # function name — file(s) defining it
+    return index.paths_for_symbol(item)
+
+
+def evaluate_cve_applicability(cve_obj, kernel_version_obj, config_file_path: str, index=None, save=True,
+                               candidates=None):
+    if candidates is None:
+        candidates = extract_candidates_from_description(cve_obj.description)
+    dot_config = load_dot_config(config_file_path)
+    if index is None:
+        index = get_kernel_config_index(kernel_version_obj)
+    enabled_mask = index.enabled_mask(dot_config)
     applicable = False
     reason = "No matching config enabled."
 
     for item in candidates:
-        if item.endswith(".c"):
-            name = item.split("/")[-1]
-            cfiles = CFile.objects.filter(name=name)
-        elif item.endswith("*.c"):
-            # wildcard based on folder name
-            folder = item.strip("*/.c").split("/")[-1]
-            cfiles = CFile.objects.filter(name__icontains=folder)
-        else:
-            # function name — fuzzy match
-            cfiles = CFile.objects.filter(name__icontains=item)
-
-        for cfile in cfiles:
-            kernel_configs = KernelConfig.objects.filter(
-                kernel_version=kernel_version_obj,
-                cfile=cfile
-            )
-            for kconfig in kernel_configs:
-                if kconfig.config.name in user_configs:
-                    applicable = True
-                    reason = f"{kconfig.config.name} enabled for {cfile.name} (match: {item})"
-                    break
-            if applicable:
+        for cfile_path in resolve_candidate_paths(index, item):
+            config_name = index.enabled_config_for_path(cfile_path, enabled_mask)
+            if config_name:
+                applicable = True
+                reason = f"{config_name} enabled for {cfile_path} (match: {item})"
                 break
         if applicable:
             break
@@ -150,4 +287,6 @@ def evaluate_cve_applicability(cve_obj, kernel_version_obj, config_file_path: st
     cve_obj.applicable = applicable
     cve_obj.reason = reason
     cve_obj.status = "done"
-    cve_obj.save()
+    cve_obj.fingerprint = cve_fingerprint(cve_obj.description, kernel_version_obj, dot_config)
+    if save:
+        cve_obj.save()
@@ -0,0 +1,206 @@
+# kernel_analysis/kernel_snapshot.py
+import os
+import sqlite3
+import stat
+
+# Per-user by default: a snapshot replaces the DB-built index, so nobody else may be able to plant one
+KERNEL_INDEX_SNAPSHOT_DIR = os.environ.get("KERNEL_INDEX_SNAPSHOT_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "kernel-analysis", "kernel-index"
+)
+# Bump whenever the snapshot schema changes; older files are then ignored
+SNAPSHOT_FORMAT = 2
+# Readers memory-map up to this much of the file instead of copying pages into SQLite's cache
+SNAPSHOT_MMAP_BYTES = 256 * 1024 * 1024
+
+SNAPSHOT_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE symbols (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT NOT NULL, name TEXT NOT NULL);
+CREATE TABLE edges (file_id INTEGER NOT NULL, config TEXT NOT NULL, mask BLOB NOT NULL);
+CREATE TABLE functions (name TEXT NOT NULL, file_id INTEGER NOT NULL);
+"""
+SNAPSHOT_INDEXES = """
+CREATE UNIQUE INDEX files_path ON files (path);
+CREATE INDEX files_name ON files (name);
+CREATE INDEX edges_file ON edges (file_id);
+CREATE INDEX functions_name ON functions (name);
+"""
+
+
+def snapshot_path(version: str) -> str:
+    return os.path.join(KERNEL_INDEX_SNAPSHOT_DIR, f"{version}.kidx")
+
+
+def _is_private(path: str) -> bool:
+    """`path` is owned by the current user and not writable by group or others."""
+    st = os.stat(path)
+    return st.st_uid == os.getuid() and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _mask_to_bytes(mask: int) -> bytes:
+    return mask.to_bytes((mask.bit_length() + 7) // 8 or 1, "little")
+
+
+def write_kernel_index_snapshot(index, path: str) -> str:
+    """
+    Write a KernelConfigIndex to a compact, read-only SQLite file: the symbol table,
+    every C file path, each edge's requirement mask and the function symbol map,
+    stamped with the index revision it was built from. The file is built next to
+    `path` (in a directory created with mode 0700) and renamed into place atomically.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), mode=0o700, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    file_ids = {path_: file_id for file_id, path_ in enumerate(index.sorted_paths)}
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SNAPSHOT_SCHEMA)
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("format", str(SNAPSHOT_FORMAT)),
+            ("version", index.version),
+            ("index_revision", str(index.index_revision)),
+        ])
+        conn.executemany(
+            "INSERT INTO symbols VALUES (?, ?)",
+            ((bit, name) for name, bit in index.symbol_ids.items())
+        )
+        conn.executemany(
+            "INSERT INTO files VALUES (?, ?, ?)",
+            ((file_id, path_, path_.rsplit("/", 1)[-1]) for path_, file_id in file_ids.items())
+        )
+        conn.executemany(
+            "INSERT INTO edges VALUES (?, ?, ?)",
+            (
+                (file_ids[path_], config, _mask_to_bytes(mask))
+                for path_, requirements in index.requirements_by_path.items()
+                for config, mask in requirements
+            )
+        )
+        conn.executemany(
+            "INSERT INTO functions VALUES (?, ?)",
+            (
+                (symbol, file_ids[path_])
+                for symbol, paths in index.paths_by_symbol.items()
+                for path_ in paths if path_ in file_ids
+            )
+        )
+        conn.executescript(SNAPSHOT_INDEXES)
+        conn.commit()
+    finally:
+        conn.close()
+    os.chmod(tmp_path, 0o444)
+    os.replace(tmp_path, path)
+    return path
+
+
+class KernelIndexSnapshot:
+    """
+    Read-only view of an exported kernel index with the same lookup methods
+    as KernelConfigIndex. Opening it only loads the symbol table; lookups are
+    indexed SQLite queries against a memory-mapped file that the OS page cache
+    shares between processes. Connections are reopened after fork.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._pid = None
+        self._enabled_masks = {}
+        meta = dict(self._query("SELECT key, value FROM meta"))
+        if meta.get("format") != str(SNAPSHOT_FORMAT):
+            raise ValueError(f"{path}: unsupported snapshot format {meta.get('format')}")
+        self.version = meta["version"]
+        self.index_revision = int(meta["index_revision"])
+        self.symbol_ids = {name: bit for bit, name in self._query("SELECT id, name FROM symbols")}
+
+    def _query(self, sql: str, params=()):
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+            self._conn.execute(f"PRAGMA mmap_size = {SNAPSHOT_MMAP_BYTES}")
+            self._pid = os.getpid()
+        return self._conn.execute(sql, params).fetchall()
+
+    def configs_for_path(self, path: str):
+        rows = self._query("SELECT e.config FROM edges e JOIN files f ON f.id = e.file_id WHERE f.path = ?", (path,))
+        return {config for (config,) in rows}
+
+    def has_path(self, path: str) -> bool:
+        return bool(self._query("SELECT 1 FROM files WHERE path = ?", (path,)))
+
+    def paths_for_name(self, name: str):
+        return [path for (path,) in self._query("SELECT path FROM files WHERE name = ? ORDER BY path", (name,))]
+
+    def paths_for_symbol(self, symbol: str):
+        rows = self._query(
+            "SELECT DISTINCT f.path FROM functions s JOIN files f ON f.id = s.file_id WHERE s.name = ? ORDER BY f.path",
+            (symbol,)
+        )
+        return [path for (path,) in rows]
+
+    def paths_with_prefix(self, prefix: str):
+        rows = self._query(
+            "SELECT path FROM files WHERE path >= ? AND path < ? ORDER BY path",
+            (prefix, prefix + "\uffff")
+        )
+        return [path for (path,) in rows]
+
+    def enabled_mask(self, dot_config) -> int:
+        mask = self._enabled_masks.get(dot_config.content_hash)
+        if mask is None:
+            mask = 0
+            for symbol in dot_config.enabled:
+                bit = self.symbol_ids.get(symbol)
+                if bit is not None:
+                    mask |= 1 << bit
+            self._enabled_masks[dot_config.content_hash] = mask
+        return mask
+
+    def requirements_for_path(self, path: str):
+        rows = self._query(
+            "SELECT e.config, e.mask FROM edges e JOIN files f ON f.id = e.file_id WHERE f.path = ? ORDER BY e.config",
+            (path,)
+        )
+        return [(config_name, int.from_bytes(mask_bytes, "little")) for config_name, mask_bytes in rows]
+
+    def enabled_config_for_path(self, path: str, enabled_mask: int):
+        for config_name, mask in self.requirements_for_path(path):
+            if mask & enabled_mask == mask:
+                return config_name
+        return None
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM files")[0][0]
+
+
+def load_kernel_index_snapshot(version: str, index_revision: int):
+    """
+    The exported snapshot for `version`, or None if there is no usable one. A snapshot
+    is only used if it was built from `index_revision` (the version's current one in
+    the DB) and neither it nor its directory can be written by other users.
+    """
+    path = snapshot_path(version)
+    if not os.path.exists(path):
+        return None
+    if not (_is_private(path) and _is_private(os.path.dirname(os.path.abspath(path)))):
+        print(f"[⚠️] Ignoring kernel index snapshot {path}: it or its directory is writable by other users")
+        return None
+    try:
+        snapshot = KernelIndexSnapshot(path)
+    except (sqlite3.Error, ValueError, KeyError) as e:
+        print(f"[⚠️] Ignoring kernel index snapshot {path}: {e}")
+        return None
+    if snapshot.index_revision != index_revision:
+        print(f"[⚠️] Ignoring kernel index snapshot {path}: built from revision {snapshot.index_revision}, "
+              f"DB is at {index_revision}")
+        return None
+    return snapshot
+
+
+def remove_kernel_index_snapshot(version: str):
+    """Forget the snapshot of a version whose DB data just changed."""
+    try:
+        os.remove(snapshot_path(version))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,124 @@
+# kernel_analysis/makefile_parser.py
+# Pure Makefile / Kbuild parsing. Nothing here may import Django or the models:
+# parse_makefile_texts' workers import this module under spawn / forkserver.
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+
+def preprocess_lines(lines):
+    new_lines = []
+    continuation = ''
+    for line in lines:
+        line = line.rstrip()
+        if line.endswith('\\'):
+            continuation += line[:-1] + ' '
+        else:
+            new_lines.append((continuation + line).strip())
+            continuation = ''
+    return new_lines
+
+
+# Makefile / Kbuild regex patterns
+obj_line_pattern = re.compile(r'obj-[^=]+\s*\+=\s*(.*)')
+config_ref_pattern = re.compile(r'\$\((CONFIG_[A-Z0-9_]+)\)')
+group_assign_pattern = re.compile(r'([a-zA-Z0-9_.-]+)-objs\s*[:+]?=\s*(.*)')
+ifdef_pattern = re.compile(r'^\s*ifdef\s+(CONFIG_[A-Z0-9_]+)')
+ifeq_pattern = re.compile(r'^\s*ifeq\s*\(\s*\$\(CONFIG_([A-Z0-9_]+)\)\s*,\s*y\s*\)')
+ifneq_pattern = re.compile(r'^\s*ifneq\s*\(\s*\$\(CONFIG_([A-Z0-9_]+)\)\s*,\s*y\s*\)')
+else_pattern = re.compile(r'^\s*else\s*$')
+endif_pattern = re.compile(r'^\s*endif\s*$')
+
+
+def parse_makefile(rel_dir: str, text: str):
+    """
+    Parse one Makefile / Kbuild file. Pure: no file system or DB access,
+    and no state shared with other files.
+    `rel_dir` is the Makefile's directory relative to the kernel root.
+    Returns (edges, o_groups, dir_gates): edges is a set of (config, C file path)
+    with paths relative to the kernel root (not yet checked for existence),
+    o_groups maps composite objects (foo.o) to their member objects, and
+    dir_gates is a set of (config or None, subdirectory) from obj-... += subdir/.
+    """
+    o_groups = {}
+    context_stack = []
+    obj_refs = []  # (configs, obj) resolved once the whole file is read
+    dir_gates = set()
+
+    for line in preprocess_lines(text.splitlines()):
+        # Context stack for ifdef / ifeq / ifneq
+        if ifdef_match := ifdef_pattern.match(line):
+            context_stack.append((ifdef_match.group(1), True))
+            continue
+        if ifeq_match := ifeq_pattern.match(line):
+            context_stack.append((f"CONFIG_{ifeq_match.group(1)}", True))
+            continue
+        if ifneq_match := ifneq_pattern.match(line):
+            context_stack.append((f"CONFIG_{ifneq_match.group(1)}", False))
+            continue
+        if else_pattern.match(line):
+            if context_stack:
+                var, val = context_stack.pop()
+                context_stack.append((var, not val))
+            continue
+        if endif_pattern.match(line):
+            if context_stack:
+                context_stack.pop()
+            continue
+
+        # Handle foo-objs := a.o b.o
+        if group_match := group_assign_pattern.match(line):
+            group, members = group_match.groups()
+            member_objs = [m for m in members.strip().split() if m.endswith(".o")]
+            o_groups.setdefault(group + ".o", []).extend(member_objs)
+            continue
+
+        # Handle obj-$(CONFIG_...) += foo.o
+        if obj_match := obj_line_pattern.search(line):
+            configs = config_ref_pattern.findall(line)
+
+            # If no direct config but inside a context block
+            if not configs and context_stack:
+                configs = [cfg for cfg, active in context_stack if active]
+
+            for obj in obj_match.group(1).split():
+                if obj.endswith(".o"):
+                    obj_refs.append((configs, obj))
+                elif obj.endswith("/"):
+                    subdir = os.path.normpath(os.path.join(rel_dir, obj))
+                    for config in configs or [None]:
+                        dir_gates.add((config, subdir))
+
+    edges = set()
+    for configs, obj in obj_refs:
+        members = o_groups.get(obj, [obj])
+        for member in members:
+            cfile = os.path.normpath(os.path.join(rel_dir, member[:-2] + ".c"))
+            for config in configs:
+                edges.add((config, cfile))
+    return edges, o_groups, dir_gates
+
+
+def makefile_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _parse_makefile_entry(entry):
+    rel_path, text = entry
+    edges, _, dir_gates = parse_makefile(os.path.dirname(rel_path), text)
+    return rel_path, (edges, dir_gates)
+
+
+def parse_makefile_texts(makefiles: dict, workers: int = None) -> dict:
+    """
+    Parse Makefile texts (kernel-relative path -> text) over a process pool.
+    Returns path -> (edges, dir_gates) as returned by parse_makefile; the result
+    does not depend on completion order.
+    """
+    workers = workers or os.cpu_count() or 1
+    entries = sorted(makefiles.items())
+    if workers == 1 or len(entries) < 2:
+        return dict(map(_parse_makefile_entry, entries))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(_parse_makefile_entry, entries, chunksize=64))
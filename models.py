@@ -0,0 +1,129 @@
+# your_app/models.py
+from django.db import models
+
+
+class KernelVersion(models.Model):
+    version = models.CharField(max_length=20, unique=True)
+    # Bumped every time the version's config index is (re)ingested
+    index_revision = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.version
+
+
+class CFile(models.Model):
+    name = models.CharField(max_length=255, db_index=True)  # basename, e.g. nf_tables_api.c
+    path = models.TextField(unique=True)  # path from the kernel root, e.g. net/netfilter/nf_tables_api.c
+
+    def __str__(self):
+        return self.path
+
+
+class Config(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class KernelConfig(models.Model):
+    kernel_version = models.ForeignKey(KernelVersion, on_delete=models.CASCADE, related_name='configs')
+    config = models.ForeignKey(Config, on_delete=models.CASCADE, related_name='kernel_configs')
+    cfile = models.ForeignKey(CFile, on_delete=models.CASCADE, related_name='kernel_configs')
+    # Other CONFIG_* symbols this edge needs: parent directory gates and Kconfig depends-on closure
+    requires = models.JSONField(default=list)
+
+    class Meta:
+        unique_together = ('kernel_version', 'config', 'cfile')
+
+    def __str__(self):
+        return f"{self.kernel_version.version} -> {self.cfile.path} -> {self.config.name}"
+
+
+class FunctionSymbol(models.Model):
+    """A function defined in a C file of one kernel version."""
+    kernel_version = models.ForeignKey(KernelVersion, on_delete=models.CASCADE, related_name='symbols')
+    name = models.CharField(max_length=128)
+    cfile = models.ForeignKey(CFile, on_delete=models.CASCADE, related_name='symbols')
+
+    class Meta:
+        unique_together = ('kernel_version', 'name', 'cfile')
+        indexes = [models.Index(fields=['kernel_version', 'name'])]
+
+    def __str__(self):
+        return f"{self.name} -> {self.cfile.path}"
+
+
+class ParsedMakefile(models.Model):
+    """Content hash and parsed edges of one Makefile / Kbuild file in one kernel version."""
+    kernel_version = models.ForeignKey(KernelVersion, on_delete=models.CASCADE, related_name='parsed_makefiles')
+    path = models.TextField()  # relative to the kernel root
+    content_hash = models.CharField(max_length=64)
+    edges = models.JSONField(default=list)  # [[config, C file path], ...] before existence checks
+    dir_gates = models.JSONField(default=list)  # [[config or null, subdirectory], ...]
+
+    class Meta:
+        unique_together = ('kernel_version', 'path')
+
+    def __str__(self):
+        return f"{self.kernel_version.version}:{self.path}"
+
+
+class CVEState(models.Model):
+    cve_id = models.CharField(max_length=32, unique=True)
+    description = models.TextField(blank=True)
+    applicable = models.BooleanField(default=False)
+    reason = models.TextField(blank=True)
+    status = models.CharField(max_length=20, default="pending")
+    # Hash of the inputs the current result was computed from, see cve_fingerprint
+    fingerprint = models.CharField(max_length=64, blank=True)
+
+    def __str__(self):
+        return self.cve_id
+
+
+class CVECandidates(models.Model):
+    """Candidates extracted from a CVE description, reused for every kernel version and .config."""
+    cve = models.OneToOneField(CVEState, on_delete=models.CASCADE, related_name='candidates')
+    description_hash = models.CharField(max_length=64)
+    extractor_version = models.PositiveIntegerField()
+    c_files = models.JSONField(default=list)  # mentioned .c files, e.g. ["nf_tables_api.c"]
+    wildcards = models.JSONField(default=list)  # directory patterns, e.g. ["net/netfilter/*.c"]
+    functions = models.JSONField(default=list)
+    keywords = models.JSONField(default=list)  # matched SUBSYSTEM_HINTS keywords
+
+    def __str__(self):
+        return f"{self.cve.cve_id} candidates"
+
+
+class JiraSyncState(models.Model):
+    """The Jira issue tracking a CVE and the field values last pushed to it."""
+    cve = models.OneToOneField(CVEState, on_delete=models.CASCADE, related_name='jira_sync')
+    issue_key = models.CharField(max_length=32, unique=True)
+    pushed_fields = models.JSONField(default=dict)  # Jira field id -> value as last sent
+    pushed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.cve.cve_id} -> {self.issue_key}"
+
+
+class ConfigVariant(models.Model):
+    """One product .config evaluated in config-matrix mode."""
+    name = models.CharField(max_length=255, unique=True)
+    config_hash = models.CharField(max_length=64)
+
+    def __str__(self):
+        return self.name
+
+
+class CVEVariantResult(models.Model):
+    cve = models.ForeignKey(CVEState, on_delete=models.CASCADE, related_name='variant_results')
+    variant = models.ForeignKey(ConfigVariant, on_delete=models.CASCADE, related_name='results')
+    applicable = models.BooleanField(default=False)
+    reason = models.TextField(blank=True)
+
+    class Meta:
+        unique_together = ('cve', 'variant')
+
+    def __str__(self):
+        return f"{self.cve.cve_id} @ {self.variant.name}: {self.applicable}"
@@ -3,19 +3,85 @@
 
 # kernel_analysis/management/commands/evaluate_cves.py
 from django.core.management.base import BaseCommand
-from kernel_analysis.cve_analysis import evaluate_all_cves
+from kernel_analysis.cve_analysis import evaluate_all_cves, evaluate_cve_matrix
 
 class Command(BaseCommand):
-    help = "Evaluate all CVEs against a given kernel version and .config"
+    help = "Evaluate all CVEs against a given kernel version and one or more .config files"
 
     def add_arguments(self, parser):
         parser.add_argument("version", type=str, help="Kernel version (e.g., 4.14.206)")
-        parser.add_argument("config", type=str, help="Path to .config file")
+        parser.add_argument("config", type=str, nargs="+",
+                            help="Path to .config file; several paths evaluate a config matrix")
+        parser.add_argument("--matrix", action="store_true",
+                            help="Store per-variant results even for a single .config")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Worker processes (default: CPU count, 1 = in-process)")
+        parser.add_argument("--chunk-size", type=int, default=500,
+                            help="CVEs per worker task")
+        parser.add_argument("--force", action="store_true",
+                            help="Re-evaluate every CVE, even those whose inputs are unchanged")
 
     def handle(self, *args, **options):
         version = options["version"]
-        config = options["config"]
+        configs = options["config"]
 
         self.stdout.write(self.style.WARNING(f"🔍 Evaluating CVEs against kernel {version}..."))
-        evaluate_all_cves(version, config)
+        if options["matrix"] or len(configs) > 1:
+            evaluate_cve_matrix(version, configs, workers=options["workers"], chunk_size=options["chunk_size"])
+        else:
+            evaluate_all_cves(version, configs[0], workers=options["workers"], chunk_size=options["chunk_size"],
+                              force=options["force"])
         self.stdout.write(self.style.SUCCESS("✅ Done evaluating all CVEs."))
+
+# kernel_analysis/management/commands/export_kernel_index.py
+from django.core.management.base import BaseCommand, CommandError
+from your_app.models import KernelVersion
+from kernel_analysis.kernel_index import build_kernel_config_index
+from kernel_analysis.kernel_snapshot import snapshot_path, write_kernel_index_snapshot
+
+class Command(BaseCommand):
+    help = "Export a kernel version's config index to a read-only snapshot for evaluation workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("version", type=str, help="Kernel version (e.g., 4.14.206)")
+        parser.add_argument("--output", type=str, default=None,
+                            help="Snapshot file (default: KERNEL_INDEX_SNAPSHOT_DIR/<version>.kidx)")
+
+    def handle(self, *args, **options):
+        version = options["version"]
+        try:
+            kernel_version = KernelVersion.objects.get(version=version)
+        except KernelVersion.DoesNotExist:
+            raise CommandError(f"Kernel version {version} not found in DB.")
+
+        self.stdout.write(self.style.WARNING(f"📤 Exporting config index for kernel {version}..."))
+        index = build_kernel_config_index(kernel_version)
+        path = write_kernel_index_snapshot(index, options["output"] or snapshot_path(version))
+        self.stdout.write(self.style.SUCCESS(f"✅ Wrote {len(index)} C files to {path}"))
+
+# kernel_analysis/management/commands/sync_cves_to_jira.py
+from django.core.management.base import BaseCommand
+from kernel_analysis.jira_sync import create_cve_issues, jira_bulk_from_env, sync_cve_results
+
+class Command(BaseCommand):
+    help = "Push changed CVE applicability results to their linked Jira issues (JIRA_URL, JIRA_EMAIL, JIRA_API_TOKEN)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=None,
+                            help="Parallel Jira requests (default: JiraBulkAPI default)")
+        parser.add_argument("--batch-size", type=int, default=500,
+                            help="Issues updated per batch before their pushed state is saved")
+        parser.add_argument("--create-issues", metavar="PROJECT_KEY", default=None,
+                            help="First create and link an issue in this project for every evaluated CVE without one")
+        parser.add_argument("--issue-type", default="Bug",
+                            help="Issue type used with --create-issues")
+
+    def handle(self, *args, **options):
+        jira_bulk = jira_bulk_from_env(options["concurrency"])
+        if options["create_issues"]:
+            self.stdout.write(self.style.WARNING("🔗 Creating Jira issues for unlinked CVEs..."))
+            create_cve_issues(jira_bulk, options["create_issues"], issue_type=options["issue_type"],
+                              batch_size=options["batch_size"])
+        self.stdout.write(self.style.WARNING("🔁 Syncing CVE results to Jira..."))
+        pushed = sync_cve_results(jira_bulk, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Updated {pushed} Jira issues."))
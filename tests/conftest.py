@@ -0,0 +1,138 @@
+import json
+import sys
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import django
+import pytest
+from django.conf import settings
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+# The sources live flat in the repository root under names that differ from the
+# modules they import each other as, so map those module names onto the files.
+
+def _package(name):
+    """Package `name` whose submodules are the .py files in the repository root."""
+    package = types.ModuleType(name)
+    package.__path__ = [str(ROOT)]
+    sys.modules[name] = package
+
+
+def _load(name, filename, start=None, stop=None):
+    """Module `name` from `filename`, optionally only the lines from marker `start` up to marker `stop`."""
+    path = ROOT / filename
+    source = path.read_text(encoding="utf-8")
+    if start is not None:
+        source = source[source.index(start):]
+    if stop is not None:
+        source = source[:source.index(stop)]
+    module = types.ModuleType(name)
+    module.__file__ = str(path)
+    sys.modules[name] = module
+    exec(compile(source, str(path), "exec"), module.__dict__)
+    return module
+
+
+_package("your_app")
+_package("kernel_analysis")
+_load("kernel_analysis.dot_config", "dot config.py")
+# kernel_rule_based.py holds the candidate extractor followed by the CVE analysis module
+_load("kernel_analysis.nlp_extractor", "kernel_rule_based.py", stop="import hashlib\nfrom django.db")
+# Gw.py starts with shell install notes and holds two scripts; the first one is blf_scan.py
+_load("blf_scan", "Gw.py", start="#!/usr/bin/env python3", stop='if __name__ == "__main__":')
+
+settings.configure(
+    INSTALLED_APPS=["your_app"],
+    DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+    DEFAULT_AUTO_FIELD="django.db.models.AutoField",
+    USE_TZ=True,
+)
+django.setup()
+_load("kernel_analysis.cve_analysis", "kernel_rule_based.py", start="import hashlib\nfrom django.db")
+
+
+@pytest.fixture(scope="session")
+def _tables():
+    from django.apps import apps
+    from django.db import connection
+
+    with connection.schema_editor() as editor:
+        for model in apps.get_app_config("your_app").get_models():
+            editor.create_model(model)
+
+
+@pytest.fixture
+def db(_tables):
+    """Database access for one test; everything it writes is rolled back afterwards."""
+    from django.db import transaction
+
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+class JiraStub:
+    """
+    Minimal local JIRA: every request is recorded as (method, path, body) and
+    answered by the first queued response for that method and path, or 404.
+    A response is (status, body, headers) with an optional `delay` in seconds.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.responses = {}
+        self._lock = threading.Lock()
+
+    def queue(self, method, path, status, body=None, headers=None, delay=0):
+        self.responses.setdefault((method, path), []).append((status, body, headers or {}, delay))
+
+    def count(self, method, path):
+        return sum(1 for m, p, _ in self.requests if (m, p) == (method, path))
+
+    def handle(self, handler):
+        length = int(handler.headers.get('Content-Length') or 0)
+        body = json.loads(handler.rfile.read(length)) if length else None
+        key = (handler.command, handler.path)
+        with self._lock:
+            self.requests.append((handler.command, handler.path, body))
+            queued = self.responses.get(key)
+            status, payload, headers, delay = queued.pop(0) if queued else (404, {'errorMessages': ['not found']}, {}, 0)
+        time.sleep(delay)
+        data = b'' if payload is None else json.dumps(payload).encode()
+        try:
+            handler.send_response(status)
+            for name, value in headers.items():
+                handler.send_header(name, value)
+            handler.send_header('Content-Type', 'application/json')
+            handler.send_header('Content-Length', str(len(data)))
+            handler.end_headers()
+            handler.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (timeouts)
+
+
+@pytest.fixture
+def jira_stub():
+    stub = JiraStub()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        do_GET = do_POST = do_PUT = lambda self: stub.handle(self)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    stub.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield stub
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,27 @@
+from types import SimpleNamespace
+
+from kernel_analysis import cve_analysis
+
+KERNEL = SimpleNamespace(version="6.1.1", index_revision=2)
+DOT_CONFIG = SimpleNamespace(content_hash="c0ffee")
+
+
+def fingerprint(description="use-after-free in nf_tables_api.c", kernel=KERNEL):
+    return cve_analysis.cve_fingerprint(description, kernel, DOT_CONFIG)
+
+
+def test_fingerprint_is_stable():
+    assert fingerprint() == fingerprint()
+
+
+def test_fingerprint_follows_every_input(monkeypatch):
+    base = fingerprint()
+    assert fingerprint(description="overflow in tun.c") != base
+    assert fingerprint(kernel=SimpleNamespace(version="6.1.1", index_revision=3)) != base
+
+    monkeypatch.setattr(cve_analysis, "RULESET_VERSION", cve_analysis.RULESET_VERSION + 1)
+    ruleset_bumped = fingerprint()
+    assert ruleset_bumped != base
+
+    monkeypatch.setattr(cve_analysis, "EXTRACTOR_VERSION", cve_analysis.EXTRACTOR_VERSION + 1)
+    assert fingerprint() != ruleset_bumped
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+import blf_scan
+
+DBC = '''
+BO_ 256 Engine: 8 ECU
+ SG_ Intel12 : 4|12@1+ (1,0) [0|0] ""
+ SG_ Moto16 : 23|16@0+ (1,0) [0|0] ""
+ SG_ MotoNibbles : 3|8@0+ (1,0) [0|0] ""
+ SG_ Temp : 56|8@1- (0.5,-10) [0|0] "degC"
+
+BO_ 257 Wide: 8 ECU
+ SG_ Signed63 : 0|63@1- (1,0) [0|0] ""
+BO_ 258 Full: 8 ECU
+ SG_ Signed64 : 0|64@1- (1,0) [0|0] ""
+ SG_ Unsigned64 : 0|64@1+ (1,0) [0|0] ""
+
+BO_ 2147484160 Muxed: 8 ECU
+ SG_ Mode M : 0|8@1+ (1,0) [0|0] ""
+ SG_ OnlyInMode1 m1 : 8|16@1+ (1,0) [0|0] ""
+ SG_ OnlyInMode2 m2 : 8|16@1- (1,0) [0|0] ""
+'''
+
+
+@pytest.fixture
+def plans(tmp_path):
+    path = tmp_path / "test.dbc"
+    path.write_text(DBC)
+    return blf_scan.compile_decode_plans(blf_scan.load_dbc(str(path)))
+
+
+def frames(*rows):
+    """rows of (arbitration id, payload bytes[, extended])"""
+    out = np.zeros(len(rows), dtype=blf_scan.BLF_FRAME_DTYPE)
+    for i, row in enumerate(rows):
+        can_id, payload = row[:2]
+        out[i]["timestamp"] = i
+        out[i]["arbitration_id"] = can_id
+        out[i]["flags"] = blf_scan.FRAME_EXTENDED if row[2:] and row[2] else 0
+        out[i]["length"] = len(payload)
+        out[i]["dlc"] = len(payload)
+        out[i]["data"][:len(payload)] = list(payload)
+    return out
+
+
+def decode(plans, batch):
+    out = blf_scan.SignalSeries()
+    blf_scan.decode_batch(batch, plans, out)
+    return {name: values.tolist() for name, (_, values) in out.arrays().items()}
+
+
+def test_intel_and_motorola_layout(plans):
+    payload = bytes([0xAB, 0xCD, 0x12, 0x34, 0x56, 0x00, 0x00, 0x14])
+    values = decode(plans, frames((256, payload)))
+
+    word = int.from_bytes(payload, "little")
+    assert values["Engine.Intel12"] == [(word >> 4) & 0xFFF]
+    assert values["Engine.Moto16"] == [0x1234]                     # bytes 2..3, MSB first
+    assert values["Engine.MotoNibbles"] == [0xBC]                  # low nibble of byte 0, high nibble of byte 1
+    assert values["Engine.Temp"] == [0x14 * 0.5 - 10]
+
+
+def test_signed_values(plans):
+    negative = bytes([0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0xF0])
+    values = decode(plans, frames(
+        (256, bytes(7) + b"\xff"),
+        (257, b"\xff" * 7 + b"\x7f"),     # all 63 bits set: -1
+        (257, bytes(7) + b"\x40"),        # only the sign bit: -2**62
+        (258, negative),
+    ))
+
+    assert values["Engine.Temp"] == [-1 * 0.5 - 10]
+    assert values["Wide.Signed63"] == [-1.0, float(-2 ** 62)]
+    assert values["Full.Signed64"] == [float(int.from_bytes(negative, "little", signed=True))]
+    assert values["Full.Unsigned64"] == [float(int.from_bytes(negative, "little"))]
+
+
+def test_short_frames_skip_signals_they_do_not_cover(plans):
+    values = decode(plans, frames((256, bytes([0xAB, 0xCD, 0x12, 0x34]))))
+    assert "Engine.Temp" not in values
+    assert values["Engine.Moto16"] == [0x1234]
+
+
+def test_multiplexed_signals(plans):
+    values = decode(plans, frames(
+        (512, bytes([1, 0x34, 0x12]), True),
+        (512, bytes([2, 0xFE, 0xFF]), True),
+        (512, bytes([3, 0x00, 0x01]), True),
+        (512, bytes([1, 0x01, 0x00])),    # standard id 512: not this message
+    ))
+
+    assert values["Muxed.Mode"] == [1, 2, 3]
+    assert values["Muxed.OnlyInMode1"] == [0x1234]
+    assert values["Muxed.OnlyInMode2"] == [-2]
+
+
+def test_interleaved_ids_keep_time_order(plans):
+    batch = frames(*[(256 if i % 2 else 257, bytes([i] * 8)) for i in range(6)])
+    out = blf_scan.SignalSeries()
+    blf_scan.decode_batch(batch, plans, out)
+    timestamps, values = out.arrays()["Engine.Temp"]
+    assert timestamps.tolist() == [1, 3, 5]
+    assert values.tolist() == [i * 0.5 - 10 for i in (1, 3, 5)]
+
+
+def test_limit_frames_cuts_the_stream():
+    batches = [np.zeros(4, dtype=blf_scan.BLF_FRAME_DTYPE) for _ in range(3)]
+    assert [len(b) for b in blf_scan.limit_frames(batches, 6)] == [4, 2]
+    assert [len(b) for b in blf_scan.limit_frames(batches, 0)] == [4, 4, 4]
+
+
+@pytest.mark.parametrize("header_size, obj_size", [(32, 0), (32, 16), (0, 0)])
+def test_object_smaller_than_its_header_is_rejected(header_size, obj_size):
+    buf = blf_scan.OBJ_HEADER_BASE.pack(blf_scan.BLF_OBJ_SIGNATURE, header_size, 1, obj_size,
+                                        blf_scan.CAN_MESSAGE) + bytes(32)
+    with pytest.raises(ValueError, match="smaller than its header"):
+        list(blf_scan.iter_blf_objects([(0, buf)]))
@@ -0,0 +1,136 @@
+import time
+
+import pytest
+
+requests = pytest.importorskip("requests")
+jira_api = pytest.importorskip("jira_api")
+
+ISSUE_PATH = '/rest/api/3/issue'
+
+
+def make_api(stub, **kwargs):
+    return jira_api.JiraAPI(stub.url, 'user@example.com', 'token', **kwargs)
+
+
+def test_retries_429_honouring_retry_after(jira_stub):
+    jira_stub.queue('GET', ISSUE_PATH + '/CVE-1', 429, {}, {'Retry-After': '1'})
+    jira_stub.queue('GET', ISSUE_PATH + '/CVE-1', 200, {'key': 'CVE-1', 'fields': {}})
+    api = make_api(jira_stub)
+
+    started = time.monotonic()
+    issue = api.get_issue('CVE-1')
+
+    assert issue == {'key': 'CVE-1', 'fields': {}}
+    assert jira_stub.count('GET', ISSUE_PATH + '/CVE-1') == 2
+    assert time.monotonic() - started >= 1
+
+
+def test_backs_off_exponentially_on_503(jira_stub, monkeypatch):
+    monkeypatch.setattr(jira_api, 'DEFAULT_BACKOFF', 0.2)
+    for _ in range(3):
+        jira_stub.queue('GET', ISSUE_PATH + '/CVE-1', 503, {})
+    jira_stub.queue('GET', ISSUE_PATH + '/CVE-1', 200, {'key': 'CVE-1', 'fields': {}})
+    api = make_api(jira_stub)
+
+    started = time.monotonic()
+    assert api.get_issue('CVE-1')['key'] == 'CVE-1'
+
+    assert jira_stub.count('GET', ISSUE_PATH + '/CVE-1') == 4
+    # urllib3 sleeps 0, 0.4 and 0.8 s before the three retries
+    assert time.monotonic() - started >= 1.2
+
+
+def test_gives_up_after_max_retries(jira_stub):
+    for _ in range(3):
+        jira_stub.queue('GET', ISSUE_PATH + '/CVE-1', 429, {}, {'Retry-After': '0'})
+    api = make_api(jira_stub, max_retries=2)
+
+    assert api.get_issue('CVE-1') is None
+    assert jira_stub.count('GET', ISSUE_PATH + '/CVE-1') == 3
+
+
+def test_post_is_not_retried_after_read_timeout(jira_stub):
+    jira_stub.queue('POST', ISSUE_PATH, 201, {'key': 'CVE-1', 'id': '1'}, delay=1)
+    jira_stub.queue('POST', ISSUE_PATH, 201, {'key': 'CVE-2', 'id': '2'})
+    api = make_api(jira_stub, timeout=0.2)
+
+    with pytest.raises(requests.RequestException):
+        api.create_issue('PROJ', 'summary', 'description', 'Bug')
+    time.sleep(1)
+    assert jira_stub.count('POST', ISSUE_PATH) == 1
+
+
+SEARCH_PATH = '/rest/api/3/search/jql'
+
+
+def cached_api(stub, keys, tmp_path):
+    """JiraAPI whose cache holds `keys` from an earlier run: on disk, not yet checked in this one."""
+    previous_run = jira_api.IssueCache(str(tmp_path))
+    for key in keys:
+        previous_run.put(key, {'key': key, 'fields': {'updated': 't1'}})
+    cache = jira_api.IssueCache(str(tmp_path))
+    return make_api(stub, cache=cache), cache
+
+
+def test_bulk_get_cached_issues_validates_once(jira_stub, tmp_path):
+    keys = ['CVE-1', 'CVE-2', 'CVE-3']
+    api, cache = cached_api(jira_stub, keys, tmp_path)
+    jira_stub.queue('POST', SEARCH_PATH, 200, {
+        'issues': [
+            {'key': 'CVE-1', 'fields': {'updated': 't1'}},
+            {'key': 'CVE-2', 'fields': {'updated': 't2'}},
+        ],
+        'isLast': True,
+    })
+    jira_stub.queue('GET', ISSUE_PATH + '/CVE-2', 200, {'key': 'CVE-2', 'fields': {'updated': 't2'}})
+
+    issues = jira_api.JiraBulkAPI(api, concurrency=2).bulk_get_cached_issues(keys)
+
+    assert [issue['key'] for issue in issues] == ['CVE-1', 'CVE-2']
+    assert issues[1]['fields']['updated'] == 't2'
+    assert jira_stub.count('POST', SEARCH_PATH) == 1
+    assert jira_stub.count('GET', ISSUE_PATH + '/CVE-1') == 0
+    assert jira_stub.count('GET', ISSUE_PATH + '/CVE-3') == 1  # deleted issue: dropped from the cache
+
+
+def test_failed_validation_keeps_cache_entries(jira_stub, tmp_path):
+    api, cache = cached_api(jira_stub, ['CVE-1'], tmp_path)
+    jira_stub.queue('POST', SEARCH_PATH, 400, {'errorMessages': ['bad query']})
+
+    api.validate_cached_issues(['CVE-1'])
+
+    assert cache.get('CVE-1') == {'key': 'CVE-1', 'fields': {'updated': 't1'}}
+    assert not cache.is_fresh('CVE-1')
+
+
+def test_get_issue_fetches_when_validation_fails(jira_stub, tmp_path):
+    api, cache = cached_api(jira_stub, ['CVE-1'], tmp_path)
+    jira_stub.queue('POST', SEARCH_PATH, 400, {'errorMessages': ['bad query']})
+    jira_stub.queue('GET', ISSUE_PATH + '/CVE-1', 200, {'key': 'CVE-1', 'fields': {'updated': 't2'}})
+
+    issue = api.get_issue('CVE-1')
+
+    assert issue['fields']['updated'] == 't2'
+    assert jira_stub.count('GET', ISSUE_PATH + '/CVE-1') == 1
+    assert cache.is_fresh('CVE-1')
+
+
+def test_bulk_create_sends_adf_descriptions(jira_stub):
+    jira_stub.queue('POST', ISSUE_PATH + '/bulk', 201, {'issues': [{'key': 'SEC-1', 'id': '1'}], 'errors': []})
+    api = make_api(jira_stub)
+
+    created = jira_api.JiraBulkAPI(api).bulk_create_issues([
+        {'project_key': 'SEC', 'summary': 'CVE-2024-0001', 'description': 'use-after-free\n\nin nf_tables',
+         'issue_type': 'Bug'},
+    ])
+
+    assert created == [('SEC-1', '1')]
+    (_, _, body), = jira_stub.requests
+    assert body['issueUpdates'][0]['fields']['description'] == {
+        'type': 'doc',
+        'version': 1,
+        'content': [
+            {'type': 'paragraph', 'content': [{'type': 'text', 'text': 'use-after-free'}]},
+            {'type': 'paragraph', 'content': [{'type': 'text', 'text': 'in nf_tables'}]},
+        ]
+    }
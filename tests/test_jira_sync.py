@@ -0,0 +1,93 @@
+import pytest
+
+from kernel_analysis import jira_sync
+from your_app import models
+
+FIELD_MAP = {"applicable": "customfield_1", "reason": "customfield_2"}
+
+
+class StubJiraBulk:
+    """Stands in for JiraBulkAPI: issues are numbered in creation order, updates are recorded."""
+
+    def __init__(self, failing_summaries=(), failing_keys=()):
+        self.failing_summaries = set(failing_summaries)
+        self.failing_keys = set(failing_keys)
+        self.issues = {}
+        self.updates = []
+
+    def bulk_create_issues(self, issues, return_errors=False):
+        created, errors = [], {}
+        for position, issue in enumerate(issues):
+            if issue["summary"] in self.failing_summaries:
+                errors[position] = "rejected"
+                continue
+            key = f"SEC-{len(self.issues) + 1}"
+            self.issues[key] = dict(issue)
+            created.append((key, str(len(self.issues))))
+        return (created, errors) if return_errors else created
+
+    def bulk_update_issues(self, updates):
+        self.updates.extend(updates)
+        return [update["issue_key"] not in self.failing_keys for update in updates]
+
+
+def make_cve(cve_id, status="done", applicable=True, reason="CONFIG_FOO enabled"):
+    return models.CVEState.objects.create(cve_id=cve_id, description=f"{cve_id} description",
+                                          status=status, applicable=applicable, reason=reason)
+
+
+@pytest.mark.usefixtures("db")
+def test_create_links_only_evaluated_cves():
+    done = make_cve("CVE-2024-0001")
+    make_cve("CVE-2024-0002", status="pending")
+    rejected = make_cve("CVE-2024-0003")
+    jira = StubJiraBulk(failing_summaries={"CVE-2024-0003"})
+
+    assert jira_sync.create_cve_issues(jira, "SEC") == 1
+
+    assert models.JiraSyncState.objects.get().cve_id == done.pk
+    assert jira.issues["SEC-1"]["summary"] == "CVE-2024-0001"
+    # a failed creation leaves the CVE unlinked and it is tried again
+    jira.failing_summaries.clear()
+    assert jira_sync.create_cve_issues(jira, "SEC") == 1
+    assert models.JiraSyncState.objects.get(cve=rejected).issue_key == "SEC-2"
+    assert jira_sync.create_cve_issues(jira, "SEC") == 0
+
+
+@pytest.mark.usefixtures("db")
+def test_sync_end_to_end_pushes_only_changes():
+    first = make_cve("CVE-2024-0001")
+    make_cve("CVE-2024-0002", applicable=False, reason="No matching config enabled.")
+    jira = StubJiraBulk()
+    jira_sync.create_cve_issues(jira, "SEC")
+
+    assert jira_sync.sync_cve_results(jira, FIELD_MAP) == 2
+    assert {update["issue_key"]: update["fields"] for update in jira.updates} == {
+        "SEC-1": {"customfield_1": "Applicable", "customfield_2": "CONFIG_FOO enabled"},
+        "SEC-2": {"customfield_1": "Not applicable", "customfield_2": "No matching config enabled."},
+    }
+
+    jira.updates.clear()
+    assert jira_sync.sync_cve_results(jira, FIELD_MAP) == 0
+    assert jira.updates == []
+
+    first.reason = "CONFIG_BAR enabled"
+    first.save()
+    assert jira_sync.sync_cve_results(jira, FIELD_MAP) == 1
+    assert jira.updates == [{"issue_key": "SEC-1", "fields": {"customfield_2": "CONFIG_BAR enabled"}}]
+
+
+@pytest.mark.usefixtures("db")
+def test_failed_update_is_retried_next_sync():
+    make_cve("CVE-2024-0001")
+    jira = StubJiraBulk(failing_keys={"SEC-1"})
+    jira_sync.create_cve_issues(jira, "SEC")
+
+    assert jira_sync.sync_cve_results(jira, FIELD_MAP) == 0
+    assert models.JiraSyncState.objects.get().pushed_at is None
+
+    jira.failing_keys.clear()
+    assert jira_sync.sync_cve_results(jira, FIELD_MAP) == 1
+    assert models.JiraSyncState.objects.get().pushed_fields == {
+        "customfield_1": "Applicable", "customfield_2": "CONFIG_FOO enabled"
+    }
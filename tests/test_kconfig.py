@@ -0,0 +1,64 @@
+import pytest
+
+import Kernele_parser as kp
+
+
+@pytest.mark.parametrize("expr, expected", [
+    ("A", {"CONFIG_A"}),
+    ("A && B", {"CONFIG_A", "CONFIG_B"}),
+    ("(A && B)", {"CONFIG_A", "CONFIG_B"}),
+    ("A && (B && C)", {"CONFIG_A", "CONFIG_B", "CONFIG_C"}),
+    ("A && B || C", set()),
+    ("(A) || (B)", set()),
+    ("A && (B || C)", {"CONFIG_A"}),
+    ("(A || B) && C", {"CONFIG_C"}),
+    ("A && !B", {"CONFIG_A"}),
+    ("!(A && B)", set()),
+    ("A && B = y && C != n", {"CONFIG_A"}),
+    ("A && m", {"CONFIG_A"}),
+    ("A && B # trailing comment", {"CONFIG_A", "CONFIG_B"}),
+])
+def test_kconfig_conjuncts(expr, expected):
+    assert kp.kconfig_conjuncts(expr) == expected
+
+
+def test_parse_kconfig_blocks_and_depends():
+    text = """
+if NET
+menu "Drivers"
+    depends on PCI
+
+config FOO
+    tristate "foo"
+    depends on BAR && (BAZ || QUX)
+    help
+      depends on IGNORED
+
+endmenu
+endif
+
+config TOP
+    bool
+"""
+    deps = kp.parse_kconfig(text)
+    assert deps["CONFIG_FOO"] == {"CONFIG_NET", "CONFIG_PCI", "CONFIG_BAR"}
+    assert deps["CONFIG_TOP"] == set()
+
+
+def test_parse_kconfig_intersects_multiple_definitions():
+    text = """
+config FOO
+    depends on ARM && COMMON
+
+config FOO
+    depends on X86 && COMMON
+"""
+    assert kp.parse_kconfig(text)["CONFIG_FOO"] == {"CONFIG_COMMON"}
+
+
+def test_merge_kconfig_deps_intersects_across_files():
+    merged = kp.merge_kconfig_deps([
+        {"CONFIG_FOO": {"CONFIG_ARM", "CONFIG_COMMON"}, "CONFIG_BAR": {"CONFIG_A"}},
+        {"CONFIG_FOO": {"CONFIG_X86", "CONFIG_COMMON"}},
+    ])
+    assert merged == {"CONFIG_FOO": {"CONFIG_COMMON"}, "CONFIG_BAR": {"CONFIG_A"}}
@@ -0,0 +1,63 @@
+import pytest
+
+from kernel_analysis import kernel_index
+
+PATHS = [
+    ("net/netfilter/nf_tables_api.c", "CONFIG_NF_TABLES"),
+    ("net/netfilter/ipvs/ip_vs_core.c", "CONFIG_IP_VS"),
+    ("net/netfilter_extra/helper.c", "CONFIG_NF_EXTRA"),
+    ("net/netfilter.c", "CONFIG_NETFILTER"),
+    ("net/ipv4/tcp_input.c", "CONFIG_INET"),
+    ("net/ipv4/tcp_output.c", "CONFIG_INET"),
+    ("net/ipv4/udp.c", "CONFIG_INET"),
+    ("drivers/net/tun.c", "CONFIG_TUN"),
+    ("drivers/staging/tun.c", "CONFIG_STAGING_TUN"),
+]
+
+
+@pytest.fixture
+def index():
+    index = kernel_index.KernelConfigIndex("6.1.1")
+    for path, config in PATHS:
+        index.add(path, path.rsplit("/", 1)[-1], config)
+    return index.finalize()
+
+
+def test_wildcard_matches_directory_and_subdirectories(index):
+    assert kernel_index.resolve_wildcard(index, "net/netfilter/*.c") == [
+        "net/netfilter/ipvs/ip_vs_core.c",
+        "net/netfilter/nf_tables_api.c",
+    ]
+
+
+def test_wildcard_with_filename_prefix(index):
+    assert kernel_index.resolve_wildcard(index, "net/ipv4/tcp_*.c") == [
+        "net/ipv4/tcp_input.c",
+        "net/ipv4/tcp_output.c",
+    ]
+
+
+def test_wildcard_without_matches(index):
+    assert kernel_index.resolve_wildcard(index, "fs/ext4/*.c") == []
+
+
+def test_c_file_exact_path(index):
+    assert kernel_index.resolve_c_file(index, "drivers/net/tun.c") == ["drivers/net/tun.c"]
+    assert kernel_index.resolve_c_file(index, "./drivers/net/tun.c") == ["drivers/net/tun.c"]
+
+
+def test_c_file_falls_back_to_basename(index):
+    assert kernel_index.resolve_c_file(index, "tun.c") == ["drivers/net/tun.c", "drivers/staging/tun.c"]
+    # an unknown directory still resolves by basename
+    assert kernel_index.resolve_c_file(index, "old/place/udp.c") == ["net/ipv4/udp.c"]
+    assert kernel_index.resolve_c_file(index, "missing.c") == []
+
+
+def test_enabled_config_for_path_needs_every_requirement():
+    index = kernel_index.KernelConfigIndex("6.1.1")
+    index.add("net/sched/cls_u32.c", "cls_u32.c", "CONFIG_NET_CLS_U32", requires=("CONFIG_NET_SCHED",))
+    index.finalize()
+    u32, sched = index.symbol_bit("CONFIG_NET_CLS_U32"), index.symbol_bit("CONFIG_NET_SCHED")
+
+    assert index.enabled_config_for_path("net/sched/cls_u32.c", u32) is None
+    assert index.enabled_config_for_path("net/sched/cls_u32.c", u32 | sched) == "CONFIG_NET_CLS_U32"
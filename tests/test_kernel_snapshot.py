@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from kernel_analysis import kernel_index, kernel_snapshot
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    path = tmp_path / "kernel-index"
+    monkeypatch.setattr(kernel_snapshot, "KERNEL_INDEX_SNAPSHOT_DIR", str(path))
+    return path
+
+
+def write_index(revision):
+    index = kernel_index.KernelConfigIndex("6.1.1", revision)
+    index.add("net/sched/cls_u32.c", "cls_u32.c", "CONFIG_NET_CLS_U32", requires=("CONFIG_NET_SCHED",))
+    index.add_symbol("u32_classify", "net/sched/cls_u32.c")
+    return kernel_snapshot.write_kernel_index_snapshot(index.finalize(), kernel_snapshot.snapshot_path("6.1.1"))
+
+
+def test_snapshot_round_trip(snapshot_dir):
+    write_index(revision=3)
+
+    snapshot = kernel_snapshot.load_kernel_index_snapshot("6.1.1", 3)
+
+    assert snapshot.index_revision == 3
+    assert snapshot.paths_for_symbol("u32_classify") == ["net/sched/cls_u32.c"]
+    assert [config for config, _ in snapshot.requirements_for_path("net/sched/cls_u32.c")] == ["CONFIG_NET_CLS_U32"]
+    assert os.stat(snapshot_dir).st_mode & 0o777 == 0o700
+
+
+def test_snapshot_from_another_revision_is_ignored(snapshot_dir):
+    write_index(revision=3)
+    assert kernel_snapshot.load_kernel_index_snapshot("6.1.1", 4) is None
+
+
+def test_snapshot_in_shared_directory_is_ignored(snapshot_dir):
+    write_index(revision=3)
+    os.chmod(snapshot_dir, 0o777)
+    assert kernel_snapshot.load_kernel_index_snapshot("6.1.1", 3) is None
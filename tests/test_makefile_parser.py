@@ -0,0 +1,95 @@
+import io
+import tarfile
+
+import Kernele_parser as kp
+from kernel_analysis import makefile_parser
+
+MAKEFILE = """\
+obj-$(CONFIG_NF_TABLES) += nf_tables.o
+nf_tables-objs := nf_tables_core.o nf_tables_api.o \\
+	nft_chain_filter.o
+obj-$(CONFIG_NFT_CT) += nft_ct.o
+obj-y += core.o
+obj-$(CONFIG_IP_VS) += ipvs/
+obj-y += utils/
+
+ifdef CONFIG_NF_LOG
+obj-y += nf_log.o
+else
+obj-y += nf_nolog.o
+endif
+
+ifeq ($(CONFIG_NF_FLOW),y)
+obj-m += nf_flow.o
+endif
+"""
+
+
+def test_edges_are_kernel_relative_and_expand_composite_objects():
+    edges, o_groups, _ = makefile_parser.parse_makefile("net/netfilter", MAKEFILE)
+
+    assert o_groups["nf_tables.o"] == ["nf_tables_core.o", "nf_tables_api.o", "nft_chain_filter.o"]
+    assert {
+        ("CONFIG_NF_TABLES", "net/netfilter/nf_tables_core.c"),
+        ("CONFIG_NF_TABLES", "net/netfilter/nf_tables_api.c"),
+        ("CONFIG_NF_TABLES", "net/netfilter/nft_chain_filter.c"),
+        ("CONFIG_NFT_CT", "net/netfilter/nft_ct.c"),
+    } <= edges
+    assert not any(path.endswith("nf_tables.c") for _, path in edges)
+
+
+def test_conditional_blocks_gate_plain_objects():
+    edges, _, _ = makefile_parser.parse_makefile("net/netfilter", MAKEFILE)
+
+    assert ("CONFIG_NF_LOG", "net/netfilter/nf_log.c") in edges
+    assert ("CONFIG_NF_FLOW", "net/netfilter/nf_flow.c") in edges
+    # the else branch is taken when CONFIG_NF_LOG is off, which no single symbol expresses
+    assert not any(path == "net/netfilter/nf_nolog.c" for _, path in edges)
+    # obj-y outside any block has no config to attribute it to
+    assert not any(path == "net/netfilter/core.c" for _, path in edges)
+
+
+def test_subdirectory_gates():
+    _, _, dir_gates = makefile_parser.parse_makefile("net/netfilter", MAKEFILE)
+    assert dir_gates == {("CONFIG_IP_VS", "net/netfilter/ipvs"), (None, "net/netfilter/utils")}
+
+
+def test_parse_makefile_texts_matches_sequential_parse():
+    makefiles = {
+        "net/netfilter/Makefile": MAKEFILE,
+        "drivers/net/Makefile": "obj-$(CONFIG_TUN) += tun.o\n",
+        "Kbuild": "obj-y += net/\n",
+    }
+    expected = {
+        path: (edges, dir_gates)
+        for path, (edges, _, dir_gates) in (
+            (path, makefile_parser.parse_makefile(path.rpartition("/")[0], text)) for path, text in makefiles.items()
+        )
+    }
+    assert makefile_parser.parse_makefile_texts(makefiles, workers=1) == expected
+    assert makefile_parser.parse_makefile_texts(makefiles, workers=2) == expected
+
+
+def _add(tar, name, text):
+    data = text.encode()
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+def test_stream_kernel_tarball_keeps_only_build_metadata(tmp_path, monkeypatch):
+    monkeypatch.setattr(kp, "KERNEL_CACHE_DIR", str(tmp_path))
+    with tarfile.open(tmp_path / "linux-6.1.1.tar.xz", "w:xz") as tar:
+        _add(tar, "linux-6.1.1/drivers/net/Makefile", "obj-$(CONFIG_TUN) += tun.o\nobj-$(CONFIG_GONE) += gone.o\n")
+        _add(tar, "linux-6.1.1/drivers/net/Kconfig", "config TUN\n\tdepends on NET\n")
+        _add(tar, "linux-6.1.1/drivers/net/tun.c", "static int\ntun_open(struct inode *inode)\n{\n\treturn 0;\n}\n")
+        _add(tar, "linux-6.1.1/drivers/net/tun.h", "#define TUN 1\n")
+
+    source = kp.stream_kernel_tarball("6.1.1")
+
+    assert set(source.read_makefiles()) == {"drivers/net/Makefile"}
+    assert set(source.read_kconfigs()) == {"drivers/net/Kconfig"}
+    assert source.c_files == {"drivers/net/tun.c"}
+    assert source.function_symbols("drivers/net/tun.c") == {"tun_open"}
+    edges, _, _ = makefile_parser.parse_makefile("drivers/net", source.read_makefiles()["drivers/net/Makefile"])
+    assert kp.filter_existing(source, edges) == {("CONFIG_TUN", "drivers/net/tun.c")}